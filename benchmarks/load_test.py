@@ -0,0 +1,415 @@
+"""
+Load test that drives the Dispatcher with synthetic user journeys.
+
+Every simulated user goes through the shop the way a real one does:
+/shop -> category -> sub-category -> skin slider swipes -> skin -> exterior slider swipes
+-> buy -> (skin type) -> payment method. The bot is set up by start_bot like in
+production, including Bot API rate limiting, Redis-backed storage and caches, request
+coalescing and prefetching, but with a fake Telegram session that answers every Bot API
+call locally and stub cs.money and Amdoren endpoints served by a local aiohttp server.
+Background refreshers and the metrics server are not started. The time of each step is
+measured from feeding the update until its handlers finish, including waits for Bot API
+rate limits, which --tg-rate-scale relaxes.
+
+Requirements:
+    - A local Postgres loaded from database/init_db.sql with migrations applied
+      (make migrate), configured with the usual pg_* settings or --db-url.
+    - A local Redis, configured with the usual redis_* settings or --redis-url. Use a
+      separate database, the load test leaves FSM data and cached payloads behind.
+
+Usage:
+    python -m benchmarks.load_test --users 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from collections.abc import AsyncGenerator
+from itertools import count
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiohttp import web
+from redis.asyncio.client import Redis
+
+from bot.data import config
+from bot.db.catalog import Catalog, get_catalog
+from bot.loader import start_bot
+from bot.states import ShopState
+from bot.utils.cache.rates import exchange_rates
+from bot.utils.callbacks import (
+    CategoryCallback,
+    ExtCallback,
+    PaymentCallback,
+    SkinCallback,
+    SkinTypeCallback,
+    SubCategoryCallback,
+)
+
+BOT_TOKEN = "42:load-test"  # nosec B105
+BOT_USER = {"id": 42, "is_bot": True, "first_name": "Bot"}
+EXTERIORS = [
+    "Factory New",
+    "Minimal Wear",
+    "Field-Tested",
+    "Well-Worn",
+    "Battle-Scarred",
+]
+# Bot API methods used by the handlers that return the sent or edited message.
+MESSAGE_METHODS = {
+    "sendMessage",
+    "sendPhoto",
+    "sendInvoice",
+    "editMessageMedia",
+    "editMessageCaption",
+    "editMessageText",
+}
+
+
+class FakeSession(BaseSession):
+    """
+    Bot session that answers Bot API calls locally instead of calling Telegram.
+
+    Methods returning a message get a message with a photo, all other methods get True.
+
+    Attributes:
+        latency (float): Seconds every call takes, to imitate the Telegram round-trip.
+        calls (defaultdict): Number of calls by Bot API method.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.calls: defaultdict[str, int] = defaultdict(int)
+        self._message_ids = count(1)
+
+    async def make_request(
+        self, bot: Bot, method: TelegramMethod[TelegramType], timeout: int | None = None
+    ) -> TelegramType:
+        self.calls[method.__api_method__] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        result: Any = True
+        if method.__api_method__ in MESSAGE_METHODS:
+            message_id = next(self._message_ids)
+            chat_id = getattr(method, "chat_id", None) or 0
+            result = {
+                "message_id": message_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": BOT_USER,
+                "photo": [
+                    {
+                        "file_id": f"photo-{message_id}",
+                        "file_unique_id": f"unique-{message_id}",
+                        "width": 512,
+                        "height": 384,
+                    }
+                ],
+            }
+        response = self.check_response(
+            bot=bot,
+            method=method,
+            status_code=200,
+            content=json.dumps({"ok": True, "result": result}),
+        )
+        return response.result  # type: ignore[return-value]
+
+    async def stream_content(self, *args, **kwargs) -> AsyncGenerator[bytes, None]:
+        raise NotImplementedError("The load test does not download files")
+        yield b""  # pragma: no cover
+
+    async def close(self):
+        pass
+
+
+def create_stub_app(latency: float) -> web.Application:
+    """
+    Creates an aiohttp application that imitates the cs.money and Amdoren APIs.
+
+    Args:
+        latency (float): Seconds every response is delayed by.
+
+    Returns:
+        web.Application: The application with /graphql and /currency routes.
+    """
+
+    async def graphql(request: web.Request) -> web.Response:
+        body = await request.json()
+        if latency:
+            await asyncio.sleep(latency)
+        if body["operationName"] == "price_trader_log":
+            data = [
+                {
+                    "name_id": name_id,
+                    "values": [{"price_trader_new": 1 + name_id % 500, "time": 0}],
+                }
+                for name_id in body["variables"]["name_ids"]
+            ]
+            return web.json_response({"data": {"price_trader_log": data}})
+        patterns = [
+            {"exterior": ext, "uuid": f"{body['variables']['name']}-{i}"}
+            for i, ext in enumerate(EXTERIORS)
+        ]
+        return web.json_response({"data": {"pattern_list": patterns}})
+
+    async def currency(request: web.Request) -> web.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        return web.json_response({"error": 0, "amount": 90.0})
+
+    app = web.Application()
+    app.router.add_post("/graphql", graphql)
+    app.router.add_get("/currency", currency)
+    return app
+
+
+class Journey:
+    """
+    A simulated user going through the shop.
+
+    Attributes:
+        user_id (int): The Telegram ID of the user, also used as the chat ID.
+        timings (dict): Step durations in seconds by step name, shared by all journeys.
+        errors (dict): Numbers of failed steps by step name, shared by all journeys.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        dp: Dispatcher,
+        bot: Bot,
+        catalog: Catalog,
+        timings: dict[str, list[float]],
+        errors: dict[str, int],
+    ):
+        self.user_id = user_id
+        self.dp = dp
+        self.bot = bot
+        self.catalog = catalog
+        self.timings = timings
+        self.errors = errors
+        self._update_ids = count(user_id * 1000)
+
+    @property
+    def _user(self) -> dict:
+        return {
+            "id": self.user_id,
+            "is_bot": False,
+            "first_name": f"user{self.user_id}",
+        }
+
+    @property
+    def _chat(self) -> dict:
+        return {"id": self.user_id, "type": "private"}
+
+    def _message(self, text: str | None = None) -> dict:
+        message = {"message_id": 1, "date": int(time.time()), "chat": self._chat}
+        if text is None:
+            message["from"] = BOT_USER
+            message["caption"] = "slider"
+            message["photo"] = [
+                {"file_id": "photo", "file_unique_id": "photo", "width": 1, "height": 1}
+            ]
+        else:
+            message["from"] = self._user
+            message["text"] = text
+        return message
+
+    async def _feed(self, step: str, update: dict) -> bool:
+        update["update_id"] = next(self._update_ids)
+        start = time.perf_counter()
+        try:
+            await self.dp.feed_raw_update(self.bot, update)
+        except Exception:
+            self.errors[step] += 1
+            return False
+        self.timings[step].append(time.perf_counter() - start)
+        return True
+
+    async def send_text(self, step: str, text: str) -> bool:
+        return await self._feed(step, {"message": self._message(text)})
+
+    async def send_callback(self, step: str, data: str) -> bool:
+        callback_query = {
+            "id": str(next(self._update_ids)),
+            "from": self._user,
+            "chat_instance": str(self.user_id),
+            "message": self._message(),
+            "data": data,
+        }
+        return await self._feed(step, {"callback_query": callback_query})
+
+    async def get_state(self) -> str | None:
+        storage: BaseStorage = self.dp.fsm.storage
+        key = StorageKey(bot_id=self.bot.id, chat_id=self.user_id, user_id=self.user_id)
+        return await storage.get_state(key)
+
+    async def run(self, rnd: random.Random, swipes: int):
+        """
+        Goes through the shop from /shop to the invoice.
+
+        Args:
+            rnd (random.Random): The source of random choices.
+            swipes (int): The number of swipes in each slider.
+        """
+        category = rnd.choice(self.catalog.categories)
+        sub_categories = self.catalog.get_sub_categories(category.id)
+        if not sub_categories:
+            return
+        sub_category = rnd.choice(sub_categories)
+        skins = self.catalog.get_skins(sub_category.id)
+        if not skins:
+            return
+
+        if not await self.send_text("shop", "/shop"):
+            return
+        category_data = CategoryCallback(id=category.id, action="view").pack()
+        if not await self.send_callback("category", category_data):
+            return
+        sub_category_data = SubCategoryCallback(
+            id=sub_category.id, action="view"
+        ).pack()
+        if not await self.send_callback("sub_category", sub_category_data):
+            return
+        for _ in range(swipes):
+            await self.send_callback("skin_swipe", "next_skin")
+
+        skin = skins[swipes % len(skins)]
+        if not await self.send_callback(
+            "skin", SkinCallback(id=skin.id, action="view").pack()
+        ):
+            return
+        for _ in range(swipes):
+            await self.send_callback("ext_swipe", "next_ext")
+
+        buy_data = ExtCallback(name="-", action="buy").pack()
+        if not await self.send_callback("buy", buy_data):
+            return
+        if await self.get_state() == ShopState.ChooseSkinType.state:
+            skin_type_data = SkinTypeCallback(
+                name="Basic", price=1.0, action="choose"
+            ).pack()
+            if not await self.send_callback("skin_type", skin_type_data):
+                return
+        payment_data = PaymentCallback(method="sber", action="choose").pack()
+        await self.send_callback("payment", payment_data)
+
+
+def print_report(
+    timings: dict[str, list[float]], errors: dict[str, int], elapsed: float, calls: dict
+):
+    """Prints throughput and latency percentiles per step."""
+    total = sum(len(values) for values in timings.values())
+    print(f"\n{total} updates in {elapsed:.2f}s, {total / elapsed:.1f} updates/s")
+    print(
+        f"{'step':<14}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    for step in dict.fromkeys([*timings, *errors]):
+        values = timings.get(step, [])
+        if len(values) >= 2:
+            q = statistics.quantiles(values, n=100)
+            p50, p95, p99 = q[49] * 1000, q[94] * 1000, q[98] * 1000
+        else:
+            p50 = p95 = p99 = values[0] * 1000 if values else 0.0
+        print(
+            f"{step:<14}{len(values):>8}{errors.get(step, 0):>8}"
+            f"{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}"
+        )
+    print("Bot API calls:", dict(calls))
+
+
+async def main(args: argparse.Namespace):
+    """Sets up the bot with local stand-ins and runs the journeys."""
+    stub_runner = web.AppRunner(create_stub_app(args.api_latency / 1000))
+    await stub_runner.setup()
+    await web.TCPSite(stub_runner, host="127.0.0.1", port=args.stub_port).start()
+    stub_url = f"http://127.0.0.1:{args.stub_port}"
+    config.BOT_TOKEN = BOT_TOKEN
+    config.CS_MONEY_API_ENDPOINT = f"{stub_url}/graphql"
+    config.CURRENCY_API_ENDPOINT = f"{stub_url}/currency"
+    config.CURRENCY_API_KEY = config.CURRENCY_API_KEY or "load-test"
+    config.TELEGRAM_GLOBAL_RATE *= args.tg_rate_scale
+    config.TELEGRAM_CHAT_RATE *= args.tg_rate_scale
+    config.TELEGRAM_CHAT_BURST *= args.tg_rate_scale
+    config.TELEGRAM_GROUP_RATE *= args.tg_rate_scale
+
+    redis = Redis.from_url(args.redis_url) if args.redis_url else None
+    session = FakeSession(latency=args.tg_latency / 1000)
+    timings: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rnd = random.Random(args.seed)
+
+    try:
+        async with start_bot(
+            run_jobs=False,
+            metrics_port=0,
+            session=session,
+            redis=redis,
+            db_url=args.db_url or config.POSTGRES_URI,
+        ) as (bot, dp):
+            catalog = get_catalog()
+            await exchange_rates.refresh()
+
+            async def run_journey(user_id: int):
+                async with semaphore:
+                    journey = Journey(user_id, dp, bot, catalog, timings, errors)
+                    await journey.run(random.Random(rnd.random()), args.swipes)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(run_journey(10_000 + i) for i in range(args.users)))
+            elapsed = time.perf_counter() - start
+            print_report(timings, errors, elapsed, session.calls)
+    finally:
+        await stub_runner.cleanup()
+        if redis is not None:
+            await redis.aclose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Load test with synthetic user journeys."
+    )
+    parser.add_argument(
+        "--users", type=int, default=1000, help="number of simulated users"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=100, help="users active at once"
+    )
+    parser.add_argument("--swipes", type=int, default=3, help="swipes in each slider")
+    parser.add_argument(
+        "--tg-latency", type=float, default=0, help="Bot API latency, ms"
+    )
+    parser.add_argument(
+        "--tg-rate-scale",
+        type=float,
+        default=1,
+        help="factor of the configured Bot API rate limits, e.g. 1000 to lift them",
+    )
+    parser.add_argument(
+        "--api-latency", type=float, default=0, help="stub API latency, ms"
+    )
+    parser.add_argument(
+        "--stub-port", type=int, default=8765, help="port of the stub APIs"
+    )
+    parser.add_argument("--db-url", help="database URL (default: pg_* settings)")
+    parser.add_argument(
+        "--redis-url",
+        help="Redis URL, e.g. redis://localhost:6379/15 (default: redis_* settings)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
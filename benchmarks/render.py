@@ -0,0 +1,294 @@
+"""
+Micro-benchmarks for the rendering hot path of the sliders.
+
+Measures the functions that run on every click (captions, slider keyboards and callback
+data packing) on real catalog rows parsed from database/init_db.sql, and prints the time
+and memory allocated per call. Results can be saved as a baseline and compared against it
+later to catch regressions in the rendering layer. Times are compared relative to a
+reference workload measured right before each benchmark, so a machine that is slower or
+busier as a whole does not count as a regression. Baselines are still machine specific, so
+they are not committed: save one on the machine the comparison runs on, e.g. before a change.
+
+Usage:
+    python -m benchmarks.render            # run and compare with benchmarks/baseline.json
+    python -m benchmarks.render --save     # run and store the results as the new baseline
+    python -m benchmarks.render --check    # exit with 1 if a benchmark regressed, or with 2
+                                           # if no baseline was saved on this machine
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from bot.data.config import LG_EXTERIORS
+from bot.handlers.user.callbacks.ext_slider import get_ext_caption
+from bot.handlers.user.callbacks.skins_slider import get_skin_caption
+from bot.keyboards.inline import get_ext_slider_menu, get_skin_slider_menu
+from bot.utils.callbacks import ExtCallback, SkinCallback, SubCategoryCallback
+
+ROOT = Path(__file__).resolve().parent.parent
+DUMP_PATH = ROOT / "database" / "init_db.sql"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+_COPY_ESCAPES = {"\\t": "\t", "\\n": "\n", "\\r": "\r", "\\\\": "\\"}
+
+
+def _unescape(value: str) -> str | None:
+    if value == "\\N":
+        return None
+    for escaped, char in _COPY_ESCAPES.items():
+        value = value.replace(escaped, char)
+    return value
+
+
+def load_table(table: str, path: Path = DUMP_PATH) -> list[dict[str, str | None]]:
+    """
+    Reads the rows of a table from the COPY block of a pg_dump file.
+
+    Args:
+        table (str): The name of the table, e.g. "skins".
+        path (Path): The dump file.
+
+    Returns:
+        list[dict]: The rows as dicts of column name to text value, None for NULL.
+    """
+    prefix = f"COPY public.{table} ("
+    rows: list[dict[str, str | None]] = []
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if line.startswith(prefix):
+                columns = line[len(prefix) : line.index(")")].split(", ")
+                break
+        else:
+            raise ValueError(f"No COPY block for table {table} in {path}")
+
+        for line in file:
+            line = line.rstrip("\n")
+            if line == "\\.":
+                break
+            rows.append(dict(zip(columns, map(_unescape, line.split("\t")))))
+    return rows
+
+
+def get_cases() -> dict[str, tuple[Callable[[object], object], list]]:
+    """
+    Builds the benchmark cases from catalog rows.
+
+    Returns:
+        dict: Pairs of a function of one argument and the arguments it is called with
+        in turn, by benchmark name.
+    """
+    skins = load_table("skins")
+    exteriors = load_table("exteriors")
+    skins_by_id = {skin["id"]: skin for skin in skins}
+
+    skin_args = [(skin["name"], skin["descr"] or "") for skin in skins]
+    ext_args = [
+        (
+            skins_by_id[ext["skin_id"]]["name"],
+            skins_by_id[ext["skin_id"]]["type"],
+            LG_EXTERIORS.get(ext["ext"] or "", "none"),
+            float(ext["price_id"] or 0) / 1000,
+            float(ext["spec_price_id"] or 0) / 1000,
+        )
+        for ext in exteriors
+    ]
+    skin_menu_args = [(int(skin["id"]), i % 50 + 1, 50) for i, skin in enumerate(skins)]
+    ext_menu_args = [(args[2], i % 5 + 1, 5) for i, args in enumerate(ext_args)]
+    skin_callbacks = [SkinCallback(id=int(skin["id"]), action="view") for skin in skins]
+    ext_callbacks = [ExtCallback(name=args[2], action="buy") for args in ext_args]
+    sub_cat_callbacks = [
+        SubCategoryCallback(id=int(skin["sub_category_id"]), action="view")
+        for skin in skins
+    ]
+
+    return {
+        "get_skin_caption": (lambda a: get_skin_caption(*a), skin_args),
+        "get_ext_caption": (lambda a: get_ext_caption(*a), ext_args),
+        "get_skin_slider_menu": (lambda a: get_skin_slider_menu(*a), skin_menu_args),
+        "get_ext_slider_menu": (lambda a: get_ext_slider_menu(*a), ext_menu_args),
+        "SkinCallback.pack": (SkinCallback.pack, skin_callbacks),
+        "SkinCallback.unpack": (
+            SkinCallback.unpack,
+            [callback.pack() for callback in skin_callbacks],
+        ),
+        "ExtCallback.pack": (ExtCallback.pack, ext_callbacks),
+        "ExtCallback.unpack": (
+            ExtCallback.unpack,
+            [callback.pack() for callback in ext_callbacks],
+        ),
+        "SubCategoryCallback.pack": (SubCategoryCallback.pack, sub_cat_callbacks),
+    }
+
+
+def reference_workload(size: int) -> str:
+    """
+    Formats and joins numbers, a yardstick of the machine speed for rendering work.
+
+    Args:
+        size (int): The number of formatted numbers.
+
+    Returns:
+        str: The joined numbers.
+    """
+    return ",".join(f"{i}:{i * 0.5:.2f}" for i in range(size))
+
+
+def measure_time(
+    func: Callable[[object], object], args: list, number: int, repeat: int
+) -> float:
+    """
+    Measures the time per call, cycling through the arguments.
+
+    Args:
+        func (Callable): The function to measure.
+        args (list): The arguments to call it with in turn.
+        number (int): Calls per measurement.
+        repeat (int): Number of measurements, the fastest one is used.
+
+    Returns:
+        float: Seconds per call.
+    """
+    cycle: Iterator = itertools.cycle(args)
+    timer = timeit.Timer(lambda: func(next(cycle)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measure_allocations(
+    func: Callable[[object], object], args: list, samples: int
+) -> float:
+    """
+    Measures the memory allocated by a call at its peak, averaged over sample arguments.
+
+    Args:
+        func (Callable): The function to measure.
+        args (list): The arguments to call it with in turn.
+        samples (int): Number of calls to average over.
+
+    Returns:
+        float: Bytes allocated per call.
+    """
+    # One warm-up call, so caches filled on the first call are not counted.
+    func(args[0])
+    total = 0
+    tracemalloc.start()
+    try:
+        for arg in itertools.islice(itertools.cycle(args), samples):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            func(arg)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        tracemalloc.stop()
+    return total / samples
+
+
+def run(number: int, repeat: int, samples: int) -> dict[str, dict[str, float]]:
+    """
+    Runs all benchmarks.
+
+    Args:
+        number (int): Calls per time measurement.
+        repeat (int): Number of time measurements per benchmark.
+        samples (int): Calls per allocation measurement.
+
+    Returns:
+        dict: Microseconds per call, time relative to the reference workload and bytes
+        per call by benchmark name.
+    """
+    results = {}
+    for name, (func, args) in get_cases().items():
+        gc.collect()
+        # Interleaved, so both timings see the same load of the machine.
+        reference = seconds = float("inf")
+        for _ in range(repeat):
+            reference = min(
+                reference, measure_time(reference_workload, [20], number, 1)
+            )
+            seconds = min(seconds, measure_time(func, args, number, 1))
+        allocated = measure_allocations(func, args, samples)
+        results[name] = {
+            "us_per_call": round(seconds * 1e6, 2),
+            "relative": round(seconds / reference, 3),
+            "bytes_per_call": round(allocated),
+        }
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """
+    Prints the results next to the baseline.
+
+    Args:
+        results (dict): The results of this run.
+        baseline (dict): The stored results, may be empty.
+        tolerance (float): Allowed growth of the relative time or of allocations, e.g. 0.2.
+
+    Returns:
+        list[str]: Names of benchmarks that regressed beyond the tolerance.
+    """
+    regressions = []
+    print(
+        f"{'benchmark':<26}{'us/call':>10}{'rel':>8}{'base':>8}{'bytes':>10}{'base':>10}"
+    )
+    for name, result in results.items():
+        base = baseline.get(name)
+        relative, allocated = result["relative"], result["bytes_per_call"]
+        line = f"{name:<26}{result['us_per_call']:>10.2f}{relative:>8.2f}"
+        line += f"{base['relative']:>8.2f}" if base else f"{'-':>8}"
+        line += f"{allocated:>10.0f}"
+        line += f"{base['bytes_per_call']:>10.0f}" if base else f"{'-':>10}"
+        if base and (
+            relative > base["relative"] * (1 + tolerance)
+            or allocated > base["bytes_per_call"] * (1 + tolerance)
+        ):
+            regressions.append(name)
+            line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmarks for captions, slider keyboards and callback data."
+    )
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per benchmark")
+    parser.add_argument("--samples", type=int, default=200, help="calls per allocation")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed regression, e.g. 0.2"
+    )
+    parser.add_argument("--save", action="store_true", help="store as the baseline")
+    parser.add_argument("--check", action="store_true", help="fail on regressions")
+    args = parser.parse_args()
+
+    if args.check and not args.save and not BASELINE_PATH.exists():
+        print(f"No baseline at {BASELINE_PATH}, save one first with --save")
+        return 2
+
+    results = run(args.number, args.repeat, args.samples)
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        BASELINE_PATH.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to {BASELINE_PATH}")
+    if regressions:
+        print("Regressed:", ", ".join(regressions))
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,17 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-BOT_TOKEN = os.getenv("token")
+BOT_TOKEN = os.getenv("token", default="")
 TOKEN_PAYMASTER = os.getenv("paymaster_token")
 TOKEN_SBER = os.getenv("sber_token")
 
 CURRENCY_API_KEY = os.getenv("currency_api_key")
+CURRENCY_API_ENDPOINT = os.getenv(
+    "currency_api_endpoint", default="https://www.amdoren.com/api/currency.php"
+)
+CS_MONEY_API_ENDPOINT = os.getenv(
+    "cs_money_api_endpoint", default="https://wiki.cs.money/api/graphql"
+)
 
 POSTGRES_HOST = os.getenv("pg_host")
 POSTGRES_PORT = os.getenv("pg_port", default=5432)
@@ -17,9 +23,84 @@ POSTGRES_PASSWORD = os.getenv("pg_password")
 POSTGRES_DB = os.getenv("pg_db")
 POSTGRES_URI = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
-REDIS_HOST = os.getenv("redis_host")
-REDIS_PORT = os.getenv("redis_port", default=6379)
-REDIS_DB = os.getenv("redis_db")
+DB_POOL_SIZE = int(os.getenv("db_pool_size", default="10"))
+DB_MAX_OVERFLOW = int(os.getenv("db_max_overflow", default="10"))
+DB_POOL_TIMEOUT = float(os.getenv("db_pool_timeout", default="30"))
+DB_POOL_RECYCLE = int(os.getenv("db_pool_recycle", default="1800"))
+DB_POOL_PRE_PING = os.getenv("db_pool_pre_ping", default="true").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("db_statement_cache_size", default="100"))
+
+REDIS_HOST = os.getenv("redis_host", default="localhost")
+REDIS_PORT = int(os.getenv("redis_port", default="6379"))
+REDIS_DB = int(os.getenv("redis_db", default="0"))
+
+BOT_MODE = os.getenv("bot_mode", default="polling")  # "polling", "webhook" or "workers"
+WEBHOOK_BASE_URL = os.getenv("webhook_base_url")
+WEBHOOK_PATH = os.getenv("webhook_path", default="/webhook")
+WEBHOOK_SECRET = os.getenv("webhook_secret")
+WEBHOOK_HOST = os.getenv("webhook_host", default="0.0.0.0")  # nosec B104
+WEBHOOK_PORT = int(os.getenv("webhook_port", default="8080"))
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("webhook_max_connections", default="40"))
+# Only one of several instances behind one webhook URL should run background refreshers.
+RUN_JOBS = os.getenv("run_jobs", default="true").lower() == "true"
+WORKER_COUNT = int(os.getenv("worker_count", default=str(os.cpu_count() or 1)))
+
+# Telegram allows about 30 messages per second in total, 1 per second to a private chat
+# (with short bursts) and 20 per minute to a group. In workers mode the global rate is
+# split between the workers.
+TELEGRAM_GLOBAL_RATE = float(os.getenv("telegram_global_rate", default="30"))
+TELEGRAM_CHAT_RATE = float(os.getenv("telegram_chat_rate", default="1"))
+TELEGRAM_CHAT_BURST = float(os.getenv("telegram_chat_burst", default="3"))
+TELEGRAM_GROUP_RATE = float(os.getenv("telegram_group_rate", default="0.33"))
+TELEGRAM_MAX_RETRIES = int(os.getenv("telegram_max_retries", default="2"))
+
+METRICS_HOST = os.getenv("metrics_host", default="127.0.0.1")
+METRICS_PORT = int(
+    os.getenv("metrics_port", default="9100")
+)  # 0 disables the metrics server
+
+HTTP_POOL_SIZE = int(os.getenv("http_pool_size", default="100"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("http_keepalive_timeout", default="30"))
+HTTP_TIMEOUT = float(os.getenv("http_timeout", default="10"))
+# cs.money requests are cut off after CS_MONEY_TIMEOUT, and after CS_MONEY_FAILURE_THRESHOLD
+# failed or slow requests in a row they are suspended until a probe succeeds.
+CS_MONEY_TIMEOUT = float(os.getenv("cs_money_timeout", default="5"))
+CS_MONEY_SLOW_CALL_DURATION = float(
+    os.getenv("cs_money_slow_call_duration", default="3")
+)
+CS_MONEY_FAILURE_THRESHOLD = int(os.getenv("cs_money_failure_threshold", default="5"))
+CS_MONEY_PROBE_INTERVAL = float(os.getenv("cs_money_probe_interval", default="15"))
+# The background price refresher requests hundreds of prices at once, so its requests have
+# their own breaker with longer limits and do not open the breaker of interactive requests.
+CS_MONEY_BATCH_TIMEOUT = float(os.getenv("cs_money_batch_timeout", default="60"))
+CS_MONEY_BATCH_SLOW_CALL_DURATION = float(
+    os.getenv("cs_money_batch_slow_call_duration", default="30")
+)
+# Identical concurrent API requests of all workers share one request, the lock has to
+# outlive HTTP_TIMEOUT and the result only has to reach workers polling for it.
+SINGLE_FLIGHT_LOCK_TTL = float(os.getenv("single_flight_lock_ttl", default="15"))
+SINGLE_FLIGHT_RESULT_TTL = float(os.getenv("single_flight_result_ttl", default="5"))
+
+PRICE_CACHE_TTL = int(os.getenv("price_cache_ttl", default="300"))
+PRICE_CACHE_STALE_TTL = int(os.getenv("price_cache_stale_ttl", default="3600"))
+PRICE_REFRESH_INTERVAL = int(os.getenv("price_refresh_interval", default="900"))
+PRICE_REFRESH_CHUNK_SIZE = int(os.getenv("price_refresh_chunk_size", default="500"))
+# Stored prices older than this many refresh intervals are shown as possibly outdated.
+PRICE_STALE_INTERVALS = int(os.getenv("price_stale_intervals", default="3"))
+EXT_PAYLOAD_TTL = int(os.getenv("ext_payload_ttl", default="300"))
+EXT_PAYLOAD_STALE_TTL = int(os.getenv("ext_payload_stale_ttl", default="30"))
+PREFETCH_QUEUE_SIZE = int(os.getenv("prefetch_queue_size", default="200"))
+PREFETCH_CONCURRENCY = int(os.getenv("prefetch_concurrency", default="4"))
+IMAGE_BACKFILL_CONCURRENCY = int(os.getenv("image_backfill_concurrency", default="4"))
+
+CATALOG_CHECK_INTERVAL = int(os.getenv("catalog_check_interval", default="10"))
+
+EXCHANGE_CURRENCIES = ["RUB"]
+EXCHANGE_RATE_CHECK_INTERVAL = int(os.getenv("ex_rate_check_interval", default="300"))
+EXCHANGE_RATE_REFRESH_INTERVAL = int(
+    os.getenv("ex_rate_refresh_interval", default="86400")
+)
+EXCHANGE_RATE_MAX_AGE = int(os.getenv("ex_rate_max_age", default="259200"))
 
 ADMINS = [
     1473001288,
@@ -0,0 +1,228 @@
+"""
+In-memory snapshot of the shop catalog.
+
+Categories, sub-categories and skins effectively never change, so they are loaded once at
+startup into an immutable snapshot with indexes by category, sub-category and skin ID.
+Handlers read it through get_catalog() without a database round-trip. load_catalog()
+builds a new snapshot and swaps it in with a single assignment, so readers always see
+either the old or the new catalog as a whole.
+
+Several bot processes keep their own snapshot. A reload requested in one of them is
+announced through a counter in Redis, which every process checks periodically (see
+CatalogSync).
+
+Functions:
+    - get_catalog: Returns the current catalog snapshot.
+    - load_catalog: Loads a new catalog snapshot from the database and makes it current.
+"""
+
+import logging
+import zlib
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+from typing import NamedTuple
+
+from redis.asyncio.client import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.db.models import Category, Skin, SubCategory
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryRow(NamedTuple):
+    id: int
+    name: str
+
+
+class SubCategoryRow(NamedTuple):
+    id: int
+    name: str
+    category_id: int
+
+
+class SkinRow(NamedTuple):
+    id: int
+    name: str
+    img: str
+    type: str
+    descr: str | None
+    category_id: int
+    sub_category_id: int
+
+
+def _group_by(rows: Iterable, key: str) -> Mapping[int, tuple]:
+    groups: dict[int, list] = {}
+    for row in rows:
+        groups.setdefault(getattr(row, key), []).append(row)
+    return MappingProxyType({k: tuple(v) for k, v in groups.items()})
+
+
+class Catalog:
+    """
+    Immutable snapshot of categories, sub-categories and skins.
+
+    Attributes:
+        version (int): Checksum of the catalog content, equal in all processes for equal data.
+        categories (tuple[CategoryRow, ...]): All categories ordered by ID.
+        skins (Mapping[int, SkinRow]): All skins by skin ID.
+    """
+
+    __slots__ = ("version", "categories", "skins", "_sub_categories", "_skins")
+
+    def __init__(
+        self,
+        categories: Iterable[CategoryRow],
+        sub_categories: Iterable[SubCategoryRow],
+        skins: Iterable[SkinRow],
+    ):
+        """
+        Builds the snapshot and its indexes.
+
+        Args:
+            categories (Iterable[CategoryRow]): Categories ordered by ID.
+            sub_categories (Iterable[SubCategoryRow]): Sub-categories ordered by ID.
+            skins (Iterable[SkinRow]): Skins ordered by ID.
+        """
+        self.categories = tuple(categories)
+        sub_categories = tuple(sub_categories)
+        skins = tuple(skins)
+
+        self.version = zlib.crc32(
+            repr((self.categories, sub_categories, skins)).encode()
+        )
+        self.skins = MappingProxyType({skin.id: skin for skin in skins})
+        self._sub_categories = _group_by(sub_categories, "category_id")
+        self._skins = _group_by(skins, "sub_category_id")
+
+    def get_sub_categories(self, cat_id: int) -> tuple[SubCategoryRow, ...]:
+        """
+        Returns sub-categories of a category ordered by ID.
+
+        Args:
+            cat_id (int): The ID of the category.
+
+        Returns:
+            tuple[SubCategoryRow, ...]: The sub-categories, empty if the category is unknown.
+        """
+        return self._sub_categories.get(cat_id, ())
+
+    def get_skins(self, sub_cat_id: int) -> tuple[SkinRow, ...]:
+        """
+        Returns skins of a sub-category ordered by ID.
+
+        Args:
+            sub_cat_id (int): The ID of the sub-category.
+
+        Returns:
+            tuple[SkinRow, ...]: The skins, empty if the sub-category is unknown.
+        """
+        return self._skins.get(sub_cat_id, ())
+
+
+_catalog = Catalog(categories=(), sub_categories=(), skins=())
+
+
+def get_catalog() -> Catalog:
+    """
+    Returns the current catalog snapshot.
+
+    Returns:
+        Catalog: The snapshot, empty until load_catalog is called.
+    """
+    return _catalog
+
+
+async def load_catalog(session: AsyncSession) -> Catalog:
+    """
+    Loads a new catalog snapshot from the database and makes it current.
+
+    Args:
+        session (AsyncSession): The database session for executing queries.
+
+    Returns:
+        Catalog: The new snapshot.
+    """
+    global _catalog
+
+    categories = await session.execute(
+        select(Category.id, Category.name).order_by(Category.id)
+    )
+    sub_categories = await session.execute(
+        select(SubCategory.id, SubCategory.name, SubCategory.category_id).order_by(
+            SubCategory.id
+        )
+    )
+    skins = await session.execute(
+        select(
+            Skin.id,
+            Skin.name,
+            Skin.img,
+            Skin.type,
+            Skin.descr,
+            Skin.category_id,
+            Skin.sub_category_id,
+        ).order_by(Skin.id)
+    )
+
+    _catalog = Catalog(
+        categories=(CategoryRow(*row) for row in categories),
+        sub_categories=(SubCategoryRow(*row) for row in sub_categories),
+        skins=(SkinRow(*row) for row in skins),
+    )
+    return _catalog
+
+
+class CatalogSync:
+    """
+    Reloads the catalog in all bot processes when one of them is asked to.
+
+    Attributes:
+        redis_key (str): The Redis key of the reload counter.
+    """
+
+    redis_key = "catalog_reloads"
+
+    def __init__(self):
+        """Initializes the sync that is not bound to Redis."""
+        self.redis: Redis | None = None
+        self.session_pool: async_sessionmaker | None = None
+        self._seen: bytes | None = None
+
+    def bind(self, redis: Redis, session_pool: async_sessionmaker):
+        """
+        Shares reload requests through Redis.
+
+        Args:
+            redis (Redis): The Redis client to keep the reload counter in.
+            session_pool (async_sessionmaker): The session maker to reload the catalog with.
+        """
+        self.redis = redis
+        self.session_pool = session_pool
+
+    async def announce(self):
+        """Asks all other processes to reload the catalog, after reloading it locally."""
+        if self.redis is not None:
+            self._seen = str(await self.redis.incr(self.redis_key)).encode()
+
+    async def check(self):
+        """Reloads the catalog if another process announced a reload since the last check."""
+        if self.redis is None or self.session_pool is None:
+            return
+
+        value = await self.redis.get(self.redis_key)
+        if self._seen is None:
+            # The catalog was loaded at startup, only later reloads matter.
+            self._seen = value or b"0"
+            return
+        if (value or b"0") == self._seen:
+            return
+
+        self._seen = value or b"0"
+        async with self.session_pool() as session:
+            catalog = await load_catalog(session)
+        logger.info("Catalog reloaded, version %s", catalog.version)
+
+
+catalog_sync = CatalogSync()
@@ -0,0 +1,130 @@
+"""
+Query-plan check for the catalog lookup indexes.
+
+Runs EXPLAIN for the catalog lookups by foreign key and verifies that each one is answered
+from its index instead of a sequential scan. Sequential scans are disabled for the check,
+because on a small development database the planner may prefer them even when the index
+fits the query; the check is about whether the index matches the query shape.
+
+Run after applying migrations:
+    python -m bot.db.check_indexes
+
+Functions:
+    - get_lookup_queries: Builds the catalog lookup queries together with the index each one should use.
+    - check_indexes: Verifies the query plans of the lookup queries.
+"""
+
+import asyncio
+import json
+import logging
+import sys
+from collections.abc import Iterator
+
+from sqlalchemy import Select, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.db.engine import create_engine
+from bot.db.models import Exterior as Ext
+from bot.db.models import Skin, SubCategory
+from bot.db.queries import build_ext_query
+
+logger = logging.getLogger(__name__)
+
+
+async def get_lookup_queries(session: AsyncSession) -> list[tuple[str, Select]]:
+    """
+    Builds the catalog lookup queries together with the index each one should use.
+
+    The exterior query is the one the exterior slider runs, the sub-category and skin
+    lookups have the shape of lookups by foreign key. All filter by an ID that exists in
+    the database.
+
+    Args:
+        session (AsyncSession): The database session for picking sample IDs.
+
+    Returns:
+        list[tuple[str, Select]]: Pairs of the expected index name and the query.
+
+    Raises:
+        RuntimeError: If the catalog tables are empty.
+    """
+    cat_id = await session.scalar(select(SubCategory.category_id).limit(1))
+    sub_cat_id = await session.scalar(select(Skin.sub_category_id).limit(1))
+    skin_id = await session.scalar(select(Ext.skin_id).limit(1))
+    if cat_id is None or sub_cat_id is None or skin_id is None:
+        raise RuntimeError("The catalog is empty, load database/init_db.sql first.")
+
+    return [
+        (
+            "ix_sub_categories_category_id_id",
+            select(SubCategory.id, SubCategory.name)
+            .where(SubCategory.category_id == cat_id)
+            .order_by(SubCategory.id),
+        ),
+        (
+            "ix_skins_sub_category_id_id",
+            select(Skin.id, Skin.name, Skin.img)
+            .where(Skin.sub_category_id == sub_cat_id)
+            .order_by(Skin.id),
+        ),
+        # The exterior slider query is built by the same function get_ext_data uses.
+        ("ix_exteriors_skin_id_id", build_ext_query(skin_id)),
+    ]
+
+
+def _iter_plan_nodes(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _iter_plan_nodes(child)
+
+
+async def check_indexes(session: AsyncSession) -> bool:
+    """
+    Verifies the query plans of the lookup queries.
+
+    Args:
+        session (AsyncSession): The database session for running EXPLAIN.
+
+    Returns:
+        bool: True if every lookup query uses its index.
+    """
+    all_used = True
+    async with session.begin():
+        queries = await get_lookup_queries(session)
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+
+        for index_name, query in queries:
+            sql = query.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            plan = await session.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+
+            nodes = list(_iter_plan_nodes(plan[0]["Plan"]))
+            used = any(node.get("Index Name") == index_name for node in nodes)
+            node_types = ", ".join(node["Node Type"] for node in nodes)
+
+            if used:
+                logger.info("%s is used: %s", index_name, node_types)
+            else:
+                logger.error("%s is not used: %s", index_name, node_types)
+                all_used = False
+
+    return all_used
+
+
+async def main() -> bool:
+    """Runs the check once against the configured database."""
+    engine = create_engine()
+    try:
+        async with async_sessionmaker(bind=engine)() as session:
+            return await check_indexes(session)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(0 if asyncio.run(main()) else 1)
@@ -0,0 +1,114 @@
+"""
+Database engine with a configurable connection pool.
+
+Pool sizing, recycling, pre-ping and the asyncpg prepared statement cache are taken from
+bot/data/config.py. The pool measures how long each checkout waits for a connection, so it
+can be sized for peak concurrency.
+
+Functions:
+    - create_engine: Creates the async database engine.
+    - get_pool_stats: Returns checkout statistics of an engine's pool.
+"""
+
+import logging
+import threading
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from bot.data import config
+
+logger = logging.getLogger(__name__)
+
+# Checkouts waiting longer than this are logged.
+SLOW_CHECKOUT = 0.5
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool that measures how long checkouts wait for a connection.
+
+    The measured time covers waiting for a free connection, opening a new one and the
+    pre-ping, i.e. everything between asking for a connection and getting a usable one.
+
+    Attributes:
+        checkouts (int): The number of checkouts so far.
+        wait_total (float): Seconds all checkouts spent waiting.
+        wait_max (float): Seconds the longest checkout spent waiting.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._stats_lock = threading.Lock()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self._record_wait(time.perf_counter() - start)
+
+    def _record_wait(self, wait: float):
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+        if wait > SLOW_CHECKOUT:
+            logger.warning(
+                "Waited %.2fs for a database connection (%s)", wait, self.status()
+            )
+
+
+def create_engine(url: str = config.POSTGRES_URI) -> AsyncEngine:
+    """
+    Creates the async database engine.
+
+    Args:
+        url (str): The database URL. Defaults to the configured Postgres URI.
+
+    Returns:
+        AsyncEngine: The engine with a TimedQueuePool.
+    """
+    return create_async_engine(
+        url=url,
+        poolclass=TimedQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        connect_args={
+            # Cache of prepared statements kept by SQLAlchemy and by asyncpg itself,
+            # set to 0 when connecting through pgbouncer in transaction mode.
+            "prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict:
+    """
+    Returns checkout statistics of an engine's pool.
+
+    Args:
+        engine (AsyncEngine): The engine created with create_engine.
+
+    Returns:
+        dict: Pool size, checked out connections, overflow, number of checkouts and
+        total and maximum checkout wait in seconds.
+    """
+    pool = engine.pool
+    if not isinstance(pool, TimedQueuePool):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": pool.checkouts,
+        "wait_total": pool.wait_total,
+        "wait_max": pool.wait_max,
+    }
@@ -0,0 +1,60 @@
+"""
+Stored preview images of exteriors.
+
+Shared by the exterior slider, which stores images it had to request from cs.money, and
+the backfill job (see bot/jobs/images.py).
+
+Functions:
+    - match_ext_images: Picks a preview image for each exterior from a pattern_list result.
+    - save_ext_images: Stores resolved preview images in exteriors.img.
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.data.config import LG_EXTERIORS
+from bot.db.models import Exterior as Ext
+
+
+def match_ext_images(
+    exteriors: Iterable[tuple[int, str]], images: dict
+) -> dict[int, str]:
+    """
+    Picks a preview image for each exterior from a pattern_list result.
+
+    Skins without exteriors (ext 'none', e.g. vanilla knives) get the first available image.
+
+    Args:
+        exteriors (Iterable): Pairs of exterior ID and short exterior name (e.g. 'fn').
+        images (dict): A dictionary mapping exterior names to image URLs (see get_ext_images).
+
+    Returns:
+        dict: A dictionary mapping exterior IDs to image URLs, exteriors without images are omitted.
+    """
+    result = {}
+    for ext_id, ext in exteriors:
+        if ext in LG_EXTERIORS:
+            img = images.get(LG_EXTERIORS[ext])
+        else:
+            img = next(iter(images.values()), None)
+        if img:
+            result[ext_id] = img
+    return result
+
+
+async def save_ext_images(session: AsyncSession, ext_images: dict[int, str]):
+    """
+    Stores resolved preview images in exteriors.img and commits the session.
+
+    Args:
+        session (AsyncSession): The database session for executing queries.
+        ext_images (dict): A dictionary mapping exterior IDs to image URLs.
+    """
+    if not ext_images:
+        return
+    await session.execute(
+        update(Ext), [{"id": ext_id, "img": img} for ext_id, img in ext_images.items()]
+    )
+    await session.commit()
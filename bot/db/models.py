@@ -1,4 +1,6 @@
-from sqlalchemy import ForeignKey, String, Text
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -42,6 +44,14 @@ class SubCategory(BaseModel):
     """
 
     __tablename__ = "sub_categories"
+    __table_args__ = (
+        Index(
+            "ix_sub_categories_category_id_id",
+            "category_id",
+            "id",
+            postgresql_include=["name"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False)
@@ -69,6 +79,14 @@ class Skin(BaseModel):
     """
 
     __tablename__ = "skins"
+    __table_args__ = (
+        Index(
+            "ix_skins_sub_category_id_id",
+            "sub_category_id",
+            "id",
+            postgresql_include=["name", "img"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False)
@@ -101,6 +119,14 @@ class Exterior(BaseModel):
     """
 
     __tablename__ = "exteriors"
+    __table_args__ = (
+        Index(
+            "ix_exteriors_skin_id_id",
+            "skin_id",
+            "id",
+            postgresql_include=["ext", "img", "price_id", "spec_price_id"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     ext: Mapped[str] = mapped_column(String(10), nullable=False)
@@ -111,3 +137,27 @@ class Exterior(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Exterior ext={self.ext}>"
+
+
+class Price(BaseModel):
+    """
+    Model representing the latest known cs.money price for an exterior price id.
+
+    Rows are written by the background price refresher (see bot/jobs/prices.py).
+
+    Attributes:
+        name_id (int): The cs.money name_id, referenced by Exterior.price_id or Exterior.spec_price_id.
+        price (float): The most recent trader price in USD.
+        fetched_at (datetime): The time the price was fetched from cs.money.
+    """
+
+    __tablename__ = "prices"
+
+    name_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    price: Mapped[float] = mapped_column(nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<Price name_id={self.name_id} price={self.price}>"
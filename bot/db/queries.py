@@ -0,0 +1,55 @@
+"""
+Database queries shared by handlers and maintenance tools.
+
+Queries the bot runs on a hot path are built here, so tools that inspect them (see
+bot/db/check_indexes.py) check exactly the query the handlers run.
+
+Functions:
+    - build_ext_query: Builds the query for a skin with its exteriors and stored prices.
+"""
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import aliased
+
+from bot.db.models import Exterior as Ext
+from bot.db.models import Price, Skin
+
+
+def build_ext_query(skin_id: int) -> Select:
+    """
+    Builds the query for a skin with its exteriors and stored prices.
+
+    Each row holds the skin's name, type, category ID and image, then the exterior's ID,
+    name, stored image, basic and special price IDs, and the stored basic and special
+    prices with the times they were fetched. Exteriors are ordered by ID.
+
+    Args:
+        skin_id (int): The ID of the skin.
+
+    Returns:
+        Select: The query.
+    """
+    basic_price_row = aliased(Price)
+    spec_price_row = aliased(Price)
+    return (
+        select(
+            Skin.name,
+            Skin.type,
+            Skin.category_id,
+            Skin.img,
+            Ext.id,
+            Ext.ext,
+            Ext.img,
+            Ext.price_id,
+            Ext.spec_price_id,
+            basic_price_row.price,
+            spec_price_row.price,
+            basic_price_row.fetched_at,
+            spec_price_row.fetched_at,
+        )
+        .join(Ext, Ext.skin_id == Skin.id)
+        .outerjoin(basic_price_row, basic_price_row.name_id == Ext.price_id)
+        .outerjoin(spec_price_row, spec_price_row.name_id == Ext.spec_price_id)
+        .where(Skin.id == skin_id)
+        .order_by(Ext.id)
+    )
@@ -1,3 +1,13 @@
-from .exceptions import DataRetrievalError
+from .exceptions import (
+    ApiRequestError,
+    CircuitOpenError,
+    DataRetrievalError,
+    ExchangeRateError,
+)
 
-__all__ = ["DataRetrievalError"]
+__all__ = [
+    "DataRetrievalError",
+    "ApiRequestError",
+    "CircuitOpenError",
+    "ExchangeRateError",
+]
@@ -4,3 +4,30 @@ class DataRetrievalError(Exception):
     def __init__(self, message="Failed to retrieve necessary data from the database"):
         self.message = message
         super().__init__(self.message)
+
+
+class ApiRequestError(Exception):
+    """Exception raised when a request to an external API fails."""
+
+    def __init__(
+        self, message="Failed to retrieve necessary data from the external API"
+    ):
+        self.message = message
+        super().__init__(self.message)
+
+
+class CircuitOpenError(ApiRequestError):
+    """Exception raised when requests to an external API are suspended after failures."""
+
+    def __init__(
+        self, message="Requests to the external API are temporarily suspended"
+    ):
+        super().__init__(message)
+
+
+class ExchangeRateError(Exception):
+    """Exception raised when no sufficiently fresh exchange rate is available."""
+
+    def __init__(self, message="No up-to-date exchange rate is available"):
+        self.message = message
+        super().__init__(self.message)
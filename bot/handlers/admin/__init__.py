@@ -0,0 +1,5 @@
+"""Handlers for bot admins"""
+
+from .commands.catalog import router as catalog_router
+
+admin_routers = (catalog_router,)
@@ -0,0 +1,35 @@
+"""
+Handler for the /reload_catalog command.
+
+Handler:
+    - reload_catalog: Rebuilds the in-memory catalog snapshot from the database in all
+      bot processes.
+"""
+
+from aiogram import F, Router, types
+from aiogram.filters import Command
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.data.config import ADMINS
+from bot.db.catalog import catalog_sync, load_catalog
+
+router = Router(name="admin_catalog")
+router.message.filter(F.from_user.id.in_(ADMINS))
+
+
+@router.message(Command(commands="reload_catalog"))
+async def reload_catalog(msg: types.Message, session: AsyncSession):
+    """
+    Rebuilds the in-memory catalog snapshot after categories, sub-categories or skins
+    were changed in the database. Other bot processes reload it on their next check.
+
+    Args:
+        msg (types.Message): The message object containing the /reload_catalog command from the admin.
+        session (AsyncSession): The database session for querying the catalog.
+    """
+    catalog = await load_catalog(session)
+    await catalog_sync.announce()
+    await msg.answer(
+        f"Catalog reloaded: {len(catalog.categories)} categories, "
+        f"{len(catalog.skins)} skins (version {catalog.version})."
+    )
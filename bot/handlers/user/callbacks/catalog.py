@@ -9,11 +9,9 @@ Handlers:
 
 from aiogram import F, Router, types
 from aiogram.fsm.context import FSMContext
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.db.models import SubCategory
-from bot.keyboards.inline import get_sub_cats
+from bot.db.catalog import get_catalog
+from bot.keyboards.inline import get_cached_sub_cats
 from bot.states import ShopState
 from bot.utils.callbacks import CategoryCallback
 
@@ -25,26 +23,22 @@ async def show_sub_categories(
     cb: types.CallbackQuery,
     state: FSMContext,
     callback_data: CategoryCallback,
-    session: AsyncSession,
 ):
     """
     Displays sub-categories when a category is selected.
 
-    Fetches sub-categories from the database based on the selected category ID,
+    Takes sub-categories of the selected category ID from the in-memory catalog,
     updates the FSM state, and sends the sub-categories as an inline keyboard.
 
     Args:
         cb (types.CallbackQuery): The callback query object from the user.
         state (FSMContext): The current FSM state of the user.
         callback_data (CategoryCallback): The data from the callback, containing the selected category ID.
-        session (AsyncSession): The database session for querying sub-categories.
     """
 
     cat_id = callback_data.id
-    sql_query = select(SubCategory).filter_by(category_id=cat_id)
-    result = await session.execute(sql_query)
-    data = result.scalars().all()
-    if len(data) == 0:
+    catalog = get_catalog()
+    if len(catalog.get_sub_categories(cat_id)) == 0:
         match msg := cb.message:
             case types.Message():
                 await msg.answer(
@@ -58,7 +52,7 @@ async def show_sub_categories(
         case types.Message():
             await msg.answer(
                 "Here are all items in category",
-                reply_markup=get_sub_cats(cat_id=cat_id, data=data),
+                reply_markup=get_cached_sub_cats(catalog, cat_id),
             )
         case _:
             print("Message to be answered is inaccessible or missing")
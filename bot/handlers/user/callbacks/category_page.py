@@ -8,7 +8,6 @@ Handlers:
 
 from aiogram import F, Router, types
 from aiogram.fsm.context import FSMContext
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.exceptions import DataRetrievalError
 from bot.handlers.user.callbacks.skins_slider import start_skin_slider
@@ -25,7 +24,6 @@ async def show_skins(
     cb: types.CallbackQuery,
     state: FSMContext,
     callback_data: SubCategoryCallback,
-    session: AsyncSession,
 ):
     """
     Displays skins when a sub-category is selected.
@@ -38,14 +36,11 @@ async def show_skins(
         cb (types.CallbackQuery): The callback query object from the user.
         state (FSMContext): The current FSM state of the user.
         callback_data (SubCategoryCallback): The data from the callback, containing the selected sub-category ID.
-        session (AsyncSession): The database session for querying skins.
     """
     try:
         sub_cat_id = callback_data.id
 
-        skin_slider = await start_skin_slider(
-            cb=cb, session=session, sub_cat_id=sub_cat_id, start_i=0
-        )
+        skin_slider = await start_skin_slider(cb=cb, sub_cat_id=sub_cat_id, start_i=0)
         await state.update_data(skin_slider=skin_slider)
         await state.set_state(ShopState.SkinSlider)
 
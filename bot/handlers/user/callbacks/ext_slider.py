@@ -7,41 +7,57 @@ Handlers:
     - back_to_skin_slider: Handles the callback to return to the skin slider.
 Utilities:
     - get_ext_caption: Generates a formatted caption for the exterior slider.
+    - reopen_skin_slider: Returns to the skin slider from an exterior slider that cannot be restored.
     - get_ext_data: Retrieves data for the exterior slider, including images and prices.
+    - get_ext_payload: Returns the shared exterior slider payload of a skin.
+    - warm_ext_payload: Builds and caches the exterior slider payload of a skin ahead of time.
     - start_ext_slider: Initializes the exterior slider with the first exterior in the list.
 """
 
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
 from aiogram import F, Router, types
 from aiogram.fsm.context import FSMContext
 from aiogram.types.input_media_photo import InputMediaPhoto
 from aiogram.utils import markdown as fmt
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from bot.data.config import LG_EXTERIORS
-from bot.db.models import Exterior as Ext
-from bot.db.models import Skin
-from bot.exceptions import DataRetrievalError
+from bot.data.config import LG_EXTERIORS, PRICE_REFRESH_INTERVAL, PRICE_STALE_INTERVALS
+from bot.db.images import match_ext_images, save_ext_images
+from bot.db.queries import build_ext_query
+from bot.exceptions import ApiRequestError, DataRetrievalError
 from bot.keyboards.inline import (
     get_ext_slider_menu,
     get_payment_methods,
     get_skin_types,
 )
 from bot.states import ShopState
-from bot.utils.api.skins import get_ext_images, get_ext_prices
+from bot.utils.api.breaker import cs_money_breaker
+from bot.utils.api.skins import get_api_skin_name, get_ext_images
+from bot.utils.cache.ext_payload import ext_payload_cache
+from bot.utils.cache.prices import price_cache
 from bot.utils.callbacks import ExtCallback
 
+logger = logging.getLogger(__name__)
+
 router = Router(name="exterior_slider")
 
 
 def get_ext_caption(
-    skin_name: str, skin_type: str, ext: str, price: float, spec_price: float
+    skin_name: str,
+    skin_type: str,
+    ext: str,
+    price: float,
+    spec_price: float,
+    stale: bool = False,
 ) -> str:
     """
     Generates a formatted caption for the exterior slider.
 
     Formats the caption based on skin name, type, exterior, and prices. Displays basic
-    and special prices if applicable.
+    and special prices if applicable, and a notice when prices may be outdated.
 
     Args:
         skin_name (str): The name of the skin.
@@ -49,6 +65,7 @@ def get_ext_caption(
         ext (str): The exterior type (e.g., 'Factory New').
         price (float): The basic price of the skin.
         spec_price (float): The special price of the skin if applicable.
+        stale (bool): Whether prices or images may be outdated, see get_ext_data.
 
     Returns:
         str: A formatted string for the caption.
@@ -68,60 +85,118 @@ def get_ext_caption(
             fmt.hitalic("$", spec_price),
             sep="",
         )
-    return fmt.text(fmt.hcode(name), "\n", "\n", price_line, "\n", "\n", sep="")
+    caption = fmt.text(fmt.hcode(name), "\n", "\n", price_line, "\n", "\n", sep="")
+    if stale:
+        caption += fmt.text(fmt.hitalic("Prices may be outdated."), "\n", "\n", sep="")
+    return caption
 
 
 async def get_ext_data(
     session: AsyncSession, skin_id: int
-) -> tuple[list[dict], str, str]:
+) -> tuple[list[dict], str, str, bool]:
     """
     Retrieves data for the exterior slider, including images and prices.
 
-    Queries the database for the skin's name, type, and exteriors. Fetches images and prices
-    for each exterior.
+    Queries the database once for the skin's name, type, and exteriors with their stored images
+    and prices. Concurrently fetches and stores images of exteriors that have none yet, and
+    fetches prices that are not stored in the database yet. If cs.money is unavailable, the
+    last known prices and the skin image stand in for the missing data. The data is marked
+    stale when that happens, when the cs.money circuit is open, or when a stored price is
+    older than PRICE_STALE_INTERVALS refresh intervals.
 
     Args:
         session (AsyncSession): The database session for executing queries.
         skin_id (int): The ID of the skin to fetch data for.
 
     Returns:
-        tuple: A tuple containing a list of exterior data, the skin type, and the skin name.
-        Returns None if skin with provided skin_id was not found in database.
+        tuple: A tuple containing a list of exterior data, the skin type, the skin name, and
+        whether prices or images may be outdated.
 
     Raises:
         DataRetrievalError: If no skin or no exterior was found by provided skin_id.
     """
 
-    # Get skin's Name, Type, and Category_id by skin_id. Return None if skin is not in db.
-    sql_query_skin = select(Skin.name, Skin.type, Skin.category_id).filter_by(
-        id=skin_id
-    )
-    result_sql = await session.execute(sql_query_skin)
-    row = result_sql.first()
-    if row:
-        skin_name, skin_type, cat_id = row
-    else:
-        raise DataRetrievalError(f"Data for skin_id {skin_id} was not in the database.")
-
-    # Get all exteriors (name, basic and special prices api id) for skin with provided skin_id.
-    sql_query_ext = select(Ext.ext, Ext.price_id, Ext.spec_price_id).filter_by(
-        skin_id=skin_id
-    )
-    result_sql = await session.execute(sql_query_ext)
+    # Get skin's Name, Type, Category_id and all its exteriors (id, name, stored image, basic
+    # and special prices api id) with prices stored by the background price refresher in one query.
+    sql_query = build_ext_query(skin_id)
+    result_sql = await session.execute(sql_query)
     ext_data = result_sql.all()
     if len(ext_data) == 0:
-        raise DataRetrievalError(f"No exteriors found for skin_id {skin_id}.")
+        raise DataRetrievalError(
+            f"No skin or exteriors found in the database for skin_id {skin_id}."
+        )
 
-    # If skin is for Knife or Gloves (cat_id 1 or 2), then add '★' to the name (cs money API uses it fsr).
-    if cat_id in [1, 2]:
-        skin_name = "★ " + skin_name
-    skin_ext, skin_price_ids, skin_spec_price_ids = zip(*ext_data)
-    images = get_ext_images(skin_name)
-    prices = get_ext_prices(list(skin_price_ids + skin_spec_price_ids))
+    skin_name, skin_type, cat_id, skin_img = ext_data[0][:4]
+    (
+        ext_ids,
+        skin_ext,
+        skin_images,
+        skin_price_ids,
+        skin_spec_price_ids,
+        base_prices,
+        spec_prices,
+        base_fetched_at,
+        spec_fetched_at,
+    ) = zip(*(row[4:] for row in ext_data))
+
+    price_ids = skin_price_ids + skin_spec_price_ids
+    prices = {
+        price_id: price
+        for price_id, price in zip(price_ids, base_prices + spec_prices)
+        if price_id and price is not None
+    }
+    missing_images = [
+        (ext_ids[i], skin_ext[i]) for i in range(len(ext_ids)) if not skin_images[i]
+    ]
+    missing_ids = [
+        price_id for price_id in price_ids if price_id and price_id not in prices
+    ]
+
+    # Stored prices stop being refreshed when the refresher fails or cs.money is down.
+    stale_before = datetime.now(timezone.utc) - timedelta(
+        seconds=PRICE_REFRESH_INTERVAL * PRICE_STALE_INTERVALS
+    )
+    stale = cs_money_breaker.is_open or any(
+        fetched_at < stale_before
+        for fetched_at in base_fetched_at + spec_fetched_at
+        if fetched_at is not None
+    )
+
+    async def fetch_images() -> dict[int, str]:
+        # Images are requested only for exteriors that were not backfilled yet and stored right away.
+        nonlocal stale
+        if not missing_images:
+            return {}
+        try:
+            images = await get_ext_images(get_api_skin_name(skin_name, cat_id))
+        except ApiRequestError as err:
+            logger.warning("Using the skin image for skin %s: %s", skin_id, err)
+            stale = True
+            return {}
+        ext_images = match_ext_images(missing_images, images)
+        await save_ext_images(session, ext_images)
+        return ext_images
+
+    async def fetch_prices() -> dict[int, float | None]:
+        # Prices not stored by the refresher yet (e.g. right after deploy) are requested through the cache.
+        nonlocal stale
+        if not missing_ids:
+            return {}
+        try:
+            return await price_cache.get_prices(missing_ids)
+        except ApiRequestError as err:
+            logger.warning("Using the last known prices for skin %s: %s", skin_id, err)
+            stale = True
+            return {}
+
+    # Both external lookups are independent, so they run concurrently.
+    ext_images, fetched_prices = await asyncio.gather(fetch_images(), fetch_prices())
+    prices.update(fetched_prices)
 
     result: list[dict] = []
     for i in range(len(skin_ext)):
         ext = LG_EXTERIORS.get(skin_ext[i], "none")
+        img = skin_images[i] or ext_images.get(ext_ids[i]) or skin_img
         price_id = skin_price_ids[i]
         spec_price_id = skin_spec_price_ids[i]
 
@@ -129,20 +204,62 @@ async def get_ext_data(
         price = prices.get(price_id, "-")
         spec_price = prices.get(spec_price_id, "-") if skin_type != "Normal" else "-"
 
-        if ext == "none":
-            img = list(images.values())[0]
-            result.append(
-                {"ext_name": ext, "img": img, "price": price, "spec_price": spec_price}
-            )
-            return result, skin_type, skin_name.replace("★ ", "")
-        else:
-            img = images.get(ext)
-
         result.append(
             {"ext_name": ext, "img": img, "price": price, "spec_price": spec_price}
         )
+        if ext == "none":
+            break
+
+    return result, skin_type, skin_name, stale
+
+
+async def get_ext_payload(session: AsyncSession, skin_id: int) -> dict:
+    """
+    Returns the shared exterior slider payload of a skin.
+
+    The payload is built with get_ext_data once per skin and cached for all users,
+    so users' FSM data only keeps the skin ID and the slider position.
+
+    Args:
+        session (AsyncSession): The database session for executing queries.
+        skin_id (int): The ID of the skin.
+
+    Returns:
+        dict: A dictionary with exterior data, skin type, skin name, exterior count and
+        whether the data is stale. Stale payloads are cached for a shorter time.
+
+    Raises:
+        DataRetrievalError: If no skin or no exterior was found by provided skin_id.
+    """
 
-    return result, skin_type, skin_name.replace("★ ", "")
+    async def build_payload() -> dict:
+        ext_data, skin_type, skin_name, stale = await get_ext_data(session, skin_id)
+        return {
+            "ext_data": ext_data,
+            "skin_type": skin_type,
+            "skin_name": skin_name,
+            "ext_count": len(ext_data),
+            "stale": stale,
+        }
+
+    return await ext_payload_cache.get_or_build(skin_id, build_payload)
+
+
+async def warm_ext_payload(session_pool: async_sessionmaker, skin_id: int):
+    """
+    Builds and caches the exterior slider payload of a skin ahead of time.
+
+    Used by the prefetcher, so a database session is only opened when the payload
+    is not cached yet.
+
+    Args:
+        session_pool (async_sessionmaker): The session maker to open a session with.
+        skin_id (int): The ID of the skin.
+    """
+    if await ext_payload_cache.get(skin_id) is not None:
+        return
+    async with session_pool() as session:
+        await get_ext_payload(session, skin_id)
 
 
 async def start_ext_slider(
@@ -160,17 +277,14 @@ async def start_ext_slider(
         start_i (int): The starting index for the slider (typically 0).
 
     Returns:
-        dict: A dictionary containing slider data including exterior details and the current position.
+        dict: A dictionary containing the skin ID and the current position.
     """
 
-    ext_data, skin_type, skin_name = await get_ext_data(session, skin_id)
-    slider = {
-        "ext_data": ext_data,
-        "skin_type": skin_type,
-        "skin_name": skin_name,
-        "ext_count": len(ext_data),
-        "pos": start_i,
-    }
+    payload = await get_ext_payload(session, skin_id)
+    ext_data = payload["ext_data"]
+    skin_type = payload["skin_type"]
+    skin_name = payload["skin_name"]
+    slider = {"skin_id": skin_id, "pos": start_i}
 
     photo = ext_data[start_i]["img"]
     caption = get_ext_caption(
@@ -179,6 +293,7 @@ async def start_ext_slider(
         ext=ext_data[start_i]["ext_name"],
         price=ext_data[start_i]["price"],
         spec_price=ext_data[start_i]["spec_price"],
+        stale=payload.get("stale", False),
     )
     reply_markup = get_ext_slider_menu(
         skin_ext=ext_data[start_i]["ext_name"],
@@ -197,53 +312,91 @@ async def start_ext_slider(
     return slider
 
 
+async def reopen_skin_slider(cb: types.CallbackQuery, state: FSMContext):
+    """
+    Returns to the skin slider from an exterior slider that cannot be restored.
+
+    Exterior sliders opened before the skin ID was kept in the state only have a copy of
+    the exterior data, so the user is asked to open the skin again.
+
+    Args:
+        cb (types.CallbackQuery): The callback query object from the user.
+        state (FSMContext): The current FSM state of the user.
+    """
+
+    await state.set_state(ShopState.SkinSlider)
+    match msg := cb.message:
+        case types.Message():
+            await msg.delete()
+            await msg.answer("This slider is outdated, please open the skin again.")
+        case _:
+            print("Message to be answered is inaccessible or missing")
+
+
 @router.callback_query(F.data.regexp(r"(prev|next)_ext"), ShopState.ExtSlider)
-async def update_slider(cb: types.CallbackQuery, state: FSMContext):
+async def update_slider(
+    cb: types.CallbackQuery,
+    state: FSMContext,
+    session: AsyncSession,
+    slider_delta: int | None = None,
+):
     """
     Handles navigation through the exterior slider (next/previous).
 
-    Updates the slider to show the next or previous exterior based on user input,
-    updating the image, caption, and navigation buttons.
+    Moves the slider by the net position change of the user's clicks, updating the image,
+    caption, and navigation buttons with a single message edit.
 
     Args:
         cb (types.CallbackQuery): The callback query object from the user.
         state (FSMContext): The current FSM state of the user.
+        session (AsyncSession): The database session for rebuilding an expired payload.
+        slider_delta (int, optional): The position change of coalesced clicks set by
+            SliderThrottleMiddleware. Defaults to one step in the clicked direction.
     """
 
     state_data = await state.get_data()
     slider = state_data["ext_slider"]
+    skin_id = slider.get("skin_id")
+    if skin_id is None:
+        await reopen_skin_slider(cb, state)
+        return
+    payload = await get_ext_payload(session, skin_id)
 
-    ext_data = slider["ext_data"]
+    ext_data = payload["ext_data"]
     past_i = slider["pos"]
 
-    if cb.data == "prev_ext":
-        curr_i = past_i - 1 if past_i != 0 else slider["ext_count"] - 1
-    else:
-        curr_i = past_i + 1 if past_i != slider["ext_count"] - 1 else 0
+    if slider_delta is None:
+        slider_delta = -1 if cb.data == "prev_ext" else 1
+    curr_i = (past_i + slider_delta) % payload["ext_count"]
 
     if curr_i == past_i:
         pass
     else:
         slider["pos"] = curr_i
         caption = get_ext_caption(
-            skin_name=slider["skin_name"],
-            skin_type=slider["skin_type"],
+            skin_name=payload["skin_name"],
+            skin_type=payload["skin_type"],
             ext=ext_data[curr_i]["ext_name"],
             price=ext_data[curr_i]["price"],
             spec_price=ext_data[curr_i]["spec_price"],
+            stale=payload.get("stale", False),
         )
         reply_markup = get_ext_slider_menu(
             skin_ext=ext_data[curr_i]["ext_name"],
             curr_pos=curr_i + 1,
-            skins_count=slider["ext_count"],
+            skins_count=payload["ext_count"],
         )
-        media = InputMediaPhoto(media=ext_data[curr_i]["img"], caption=caption)
+        photo = ext_data[curr_i]["img"]
 
         await state.update_data(ext_slider=slider)
+        # One Bot API call per swipe: caption and keyboard are sent together with the photo,
+        # or without it when neighbouring exteriors share the same image.
         match msg := cb.message:
+            case types.Message() if photo == ext_data[past_i]["img"]:
+                await msg.edit_caption(caption=caption, reply_markup=reply_markup)
             case types.Message():
-                await msg.edit_media(media=media)
-                await msg.edit_reply_markup(reply_markup=reply_markup)
+                media = InputMediaPhoto(media=photo, caption=caption)
+                await msg.edit_media(media=media, reply_markup=reply_markup)
             case _:
                 print("Message to be answered is inaccessible or missing")
 
@@ -252,6 +405,7 @@ async def update_slider(cb: types.CallbackQuery, state: FSMContext):
 async def buy_skin(
     cb: types.CallbackQuery,
     state: FSMContext,
+    session: AsyncSession,
 ):
     """
     Handles the process of initiating a skin purchase.
@@ -262,14 +416,20 @@ async def buy_skin(
     Args:
         cb (types.CallbackQuery): The callback query object from the user.
         state (FSMContext): The current FSM state of the user.
+        session (AsyncSession): The database session for rebuilding an expired payload.
     """
 
     state_data = await state.get_data()
     slider = state_data["ext_slider"]
-
-    ext_data = slider["ext_data"]
-    skin_name = slider["skin_name"]
-    skin_type = slider["skin_type"]
+    skin_id = slider.get("skin_id")
+    if skin_id is None:
+        await reopen_skin_slider(cb, state)
+        return
+    payload = await get_ext_payload(session, skin_id)
+
+    ext_data = payload["ext_data"]
+    skin_name = payload["skin_name"]
+    skin_type = payload["skin_type"]
     pos = slider["pos"]
 
     ext = ext_data[pos]["ext_name"]
@@ -8,6 +8,7 @@ Handlers:
 Utilities:
     - get_skin_caption: Generates a formatted caption for the skin slider.
     - get_skins_data: Retrieves data for the skin slider, including images and descriptions.
+    - prefetch_skins: Schedules warming of exterior data for the current and adjacent skins.
     - start_skin_slider: Initializes the skin slider with the first skin in the list.
 """
 
@@ -15,12 +16,12 @@ from aiogram import F, Router, types
 from aiogram.fsm.context import FSMContext
 from aiogram.types.input_media_photo import InputMediaPhoto
 from aiogram.utils import markdown as fmt
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.db.models import Skin
+from bot.db.catalog import get_catalog
 from bot.exceptions import DataRetrievalError
 from bot.handlers.user.callbacks.ext_slider import start_ext_slider
+from bot.jobs.prefetch import prefetcher
 from bot.keyboards.inline import get_skin_slider_menu
 from bot.states import ShopState
 from bot.utils.callbacks import SkinCallback
@@ -52,15 +53,14 @@ def get_skin_caption(skin_name: str, skin_descr: str) -> str:
     )
 
 
-async def get_skins_data(session: AsyncSession, sub_cat_id: int) -> tuple:
+def get_skins_data(sub_cat_id: int) -> tuple:
     """
     Retrieves data for the skin slider, including images and descriptions.
 
-    Queries the database for skins under a specific sub-category and gathers
+    Takes skins under a specific sub-category from the in-memory catalog and gathers
     their IDs, names, images, and descriptions.
 
     Args:
-        session (AsyncSession): The database session for executing queries.
         sub_cat_id (int): The ID of the sub-category to fetch skins for.
 
     Returns:
@@ -70,52 +70,60 @@ async def get_skins_data(session: AsyncSession, sub_cat_id: int) -> tuple:
         DataRetrievalError: If no skins were found for provided sub_cat_id.
     """
 
-    sql_query = (
-        select(Skin.id, Skin.name, Skin.img, Skin.descr)
-        .filter_by(sub_category_id=sub_cat_id)
-        .order_by(Skin.id)
-    )
-    result = await session.execute(sql_query)
-    skins_data = result.all()
+    skins_data = get_catalog().get_skins(sub_cat_id)
     if len(skins_data) == 0:
         raise DataRetrievalError(f"No skins found for sub-category {sub_cat_id}.")
 
-    skin_ids, skin_names, skin_images, skins_descr = zip(*skins_data)
+    skin_ids = tuple(skin.id for skin in skins_data)
+    skin_names = tuple(skin.name for skin in skins_data)
+    skin_images = tuple(skin.img for skin in skins_data)
+    skins_descr = tuple(skin.descr for skin in skins_data)
     skin_count = len(skins_data)
 
     return skin_ids, skin_names, skin_images, skins_descr, skin_count
 
 
+def prefetch_skins(user_id: int, skin_ids: tuple[int, ...], pos: int):
+    """
+    Schedules warming of exterior data for the current and adjacent skins.
+
+    The skin on screen is warmed first, then the next and the previous one, so the
+    exterior slider of the skin the user opens next is usually cached already.
+
+    Args:
+        user_id (int): The ID of the user browsing the slider.
+        skin_ids (tuple[int, ...]): IDs of all skins in the slider.
+        pos (int): The index of the skin on screen.
+    """
+    count = len(skin_ids)
+    prefetcher.schedule(
+        user_id,
+        (skin_ids[pos], skin_ids[(pos + 1) % count], skin_ids[(pos - 1) % count]),
+    )
+
+
 async def start_skin_slider(
-    cb: types.CallbackQuery, session: AsyncSession, sub_cat_id: int, start_i: int
+    cb: types.CallbackQuery, sub_cat_id: int, start_i: int
 ) -> dict:
     """
     Initializes the skin slider with the first skin in the list.
 
-    Fetches skin data and displays the first skin with its image, caption, and slider menu.
+    Fetches skin data and displays the first skin with its image, caption, and slider menu,
+    and starts warming exterior data of the first skin and its neighbours.
 
     Args:
         cb (types.CallbackQuery): The callback query object from the user.
-        session (AsyncSession): The database session for querying skins.
         sub_cat_id (int): The ID of the sub-category to display skins for.
         start_i (int): The starting index for the slider (typically 0).
 
     Returns:
-        dict: A dictionary containing slider data including skin details and the current position.
+        dict: A dictionary containing the sub-category ID and the current position.
     """
 
-    skin_ids, skin_names, skin_images, skins_descr, skin_count = await get_skins_data(
-        session, sub_cat_id
+    skin_ids, skin_names, skin_images, skins_descr, skin_count = get_skins_data(
+        sub_cat_id
     )
-    slider = {
-        "skin_ids": skin_ids,
-        "skin_names": skin_names,
-        "skin_images": skin_images,
-        "skins_descr": skins_descr,
-        "skin_count": skin_count,
-        "sub_cat_id": sub_cat_id,
-        "pos": start_i,
-    }
+    slider = {"sub_cat_id": sub_cat_id, "pos": start_i}
 
     photo = skin_images[start_i]
     caption = get_skin_caption(
@@ -125,6 +133,7 @@ async def start_skin_slider(
         skin_id=skin_ids[start_i], curr_pos=start_i + 1, skins_count=skin_count
     )
 
+    prefetch_skins(cb.from_user.id, skin_ids, start_i)
     match msg := cb.message:
         case types.Message():
             await msg.answer_photo(
@@ -135,47 +144,71 @@ async def start_skin_slider(
 
 
 @router.callback_query(F.data.regexp(r"(next|prev)_skin"), ShopState.SkinSlider)
-async def update_skin_slider(cb: types.CallbackQuery, state: FSMContext):
+async def update_skin_slider(
+    cb: types.CallbackQuery, state: FSMContext, slider_delta: int | None = None
+):
     """
     Handles navigation through the skin slider (next/previous).
 
-    Updates the slider to show the next or previous skin based on user input,
-    updating the image, caption, and navigation buttons.
+    Moves the slider by the net position change of the user's clicks, updating the image,
+    caption, and navigation buttons with a single message edit.
+    If the sub-category has no skins anymore, returns the user to the sub-category page.
 
     Args:
         cb (types.CallbackQuery): The callback query object from the user.
         state (FSMContext): The current FSM state of the user.
+        slider_delta (int, optional): The position change of coalesced clicks set by
+            SliderThrottleMiddleware. Defaults to one step in the clicked direction.
     """
 
     state_data = await state.get_data()
     slider = state_data["skin_slider"]
+    try:
+        skin_ids, skin_names, skin_images, skins_descr, skin_count = get_skins_data(
+            slider["sub_cat_id"]
+        )
+    except DataRetrievalError:
+        # The sub-category was removed or emptied by a catalog reload.
+        await state.set_state(ShopState.CategoryPage)
+        prefetcher.cancel(cb.from_user.id)
+        match msg := cb.message:
+            case types.Message():
+                await msg.delete()
+                await msg.answer(
+                    "These skins are no longer available. Please choose another sub-category."
+                )
+        return
 
-    past_i = slider["pos"]
+    # The position is clamped in case the catalog was reloaded with fewer skins.
+    past_i = min(slider["pos"], skin_count - 1)
 
-    if cb.data == "prev_skin":
-        curr_i = past_i - 1 if past_i != 0 else slider["skin_count"] - 1
-    else:
-        curr_i = past_i + 1 if past_i != slider["skin_count"] - 1 else 0
+    if slider_delta is None:
+        slider_delta = -1 if cb.data == "prev_skin" else 1
+    curr_i = (past_i + slider_delta) % skin_count
+
+    # Sub-category with a single skin or a full circle, there is nothing to edit.
+    if curr_i == past_i:
+        return
 
     slider["pos"] = curr_i
-    media = InputMediaPhoto(
-        media=slider["skin_images"][curr_i],
-        caption=get_skin_caption(
-            slider["skin_names"][curr_i], slider["skins_descr"][curr_i]
-        ),
-    )
+    prefetch_skins(cb.from_user.id, skin_ids, curr_i)
+    caption = get_skin_caption(skin_names[curr_i], skins_descr[curr_i])
 
     reply_markup = get_skin_slider_menu(
-        skin_id=slider["skin_ids"][curr_i],
+        skin_id=skin_ids[curr_i],
         curr_pos=curr_i + 1,
-        skins_count=slider["skin_count"],
+        skins_count=skin_count,
     )
 
     await state.update_data(skin_slider=slider)
+    # One Bot API call per swipe: caption and keyboard are sent together with the photo,
+    # or without it when neighbouring skins share the same image.
     match cb.message:
+        case types.Message() if skin_images[curr_i] == skin_images[past_i]:
+            await cb.message.edit_caption(caption=caption, reply_markup=reply_markup)
         case types.Message():
-            await cb.message.edit_media(media=media)
-            await cb.message.edit_reply_markup(reply_markup=reply_markup)
+            media = InputMediaPhoto(media=skin_images[curr_i], caption=caption)
+            await cb.message.edit_media(media=media, reply_markup=reply_markup)
 
 
 @router.callback_query(SkinCallback.filter(F.action == "view"), ShopState.SkinSlider)
@@ -220,7 +253,8 @@ async def back_to_sub_cat_page(cb: types.CallbackQuery, state: FSMContext):
     """
     Handles the callback to return to the sub-category page.
 
-    Changes the FSM state back to the CategoryPage state and deletes the current message.
+    Changes the FSM state back to the CategoryPage state, stops warming exterior data for
+    the user and deletes the current message.
 
     Args:
         cb (types.CallbackQuery): The callback query object from the user.
@@ -228,6 +262,7 @@ async def back_to_sub_cat_page(cb: types.CallbackQuery, state: FSMContext):
     """
 
     await state.set_state(ShopState.CategoryPage)
+    prefetcher.cancel(cb.from_user.id)
     match cb.message:
         case types.Message():
             await cb.message.delete()
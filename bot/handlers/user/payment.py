@@ -14,7 +14,7 @@ from aiogram.types import LabeledPrice
 
 from bot.data.config import TOKEN_PAYMASTER, TOKEN_SBER
 from bot.states import ShopState
-from bot.utils.api.skins import get_ex_rate
+from bot.utils.cache.rates import exchange_rates
 
 router = Router(name="payment")
 
@@ -51,7 +51,7 @@ async def send_invoice(
     """
     Sends an invoice to the user based on the selected payment method.
 
-    Converts the price to RUB using the current exchange rate, generates
+    Converts the price to RUB using the cached exchange rate, generates
     the invoice data, and sends it to the user via a Telegram invoice.
 
     Args:
@@ -60,9 +60,12 @@ async def send_invoice(
         title (str): The title of the item being purchased.
         price (float): The price of the item in USD.
         method (str): The payment method chosen by the user ('sber' or 'paymaster').
+
+    Raises:
+        ExchangeRateError: If no up-to-date exchange rate is available.
     """
 
-    exchange_rate = get_ex_rate("RUB")
+    exchange_rate = await exchange_rates.get_fresh_rate("RUB")
     price_rub = price * exchange_rate
 
     invoice_data = generate_invoice(
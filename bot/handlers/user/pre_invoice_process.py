@@ -11,6 +11,7 @@ Handlers:
 from aiogram import Bot, F, Router, types
 from aiogram.fsm.context import FSMContext
 
+from bot.exceptions import ExchangeRateError
 from bot.handlers.user.payment import send_invoice
 from bot.keyboards.inline import get_payment_methods
 from bot.states import ShopState
@@ -101,8 +102,16 @@ async def start_payment(
 
     title = f"{buy_type} {buy_title}" if buy_type != "Basic" else buy_title
 
-    await state.set_state(ShopState.Payment)
-    await send_invoice(cb=cb, bot=bot, title=title, price=buy_price, method=method)
+    try:
+        await send_invoice(cb=cb, bot=bot, title=title, price=buy_price, method=method)
+        await state.set_state(ShopState.Payment)
+
+    except ExchangeRateError:
+        match msg := cb.message:
+            case types.Message():
+                await msg.answer(
+                    "An error occurred while processing your request. Please try again later."
+                )
 
 
 @router.callback_query(F.data == "back_from_pay_methods", ShopState.ChoosePaymentMethod)
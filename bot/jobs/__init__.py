@@ -0,0 +1 @@
+"""Background jobs that keep cached external data up to date"""
@@ -0,0 +1,97 @@
+"""
+Backfill of exterior preview images.
+
+Resolves one pattern preview per exterior with pattern_list and stores it in
+exteriors.img, so the exterior slider only asks cs.money for rows still missing an image.
+
+Run once after loading the database dump:
+    python -m bot.jobs.images
+
+Functions:
+    - backfill_images: Resolves and stores images of all exteriors without one.
+"""
+
+import asyncio
+import logging
+from itertools import groupby
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from bot.data import config
+from bot.db.engine import create_engine
+from bot.db.images import match_ext_images, save_ext_images
+from bot.db.models import Exterior as Ext
+from bot.db.models import Skin
+from bot.utils.api.client import close_http_session, open_http_session
+from bot.utils.api.skins import get_api_skin_name, get_ext_images
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_images(
+    session_pool: async_sessionmaker,
+    concurrency: int = config.IMAGE_BACKFILL_CONCURRENCY,
+) -> int:
+    """
+    Resolves and stores images of all exteriors without one.
+
+    Skins are processed concurrently with one pattern_list request each. A failed request
+    is logged and the skin is left for the next run.
+
+    Args:
+        session_pool (async_sessionmaker): The session maker for database connections.
+        concurrency (int): The maximum number of simultaneous pattern_list requests.
+
+    Returns:
+        int: The number of stored images.
+    """
+    async with session_pool() as session:
+        sql_query = (
+            select(Ext.id, Ext.ext, Ext.skin_id, Skin.name, Skin.category_id)
+            .join(Skin, Skin.id == Ext.skin_id)
+            .where(Ext.img.is_(None))
+            .order_by(Ext.skin_id, Ext.id)
+        )
+        rows = (await session.execute(sql_query)).all()
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def backfill_skin(skin_rows: list) -> int:
+        skin_name = get_api_skin_name(skin_rows[0].name, skin_rows[0].category_id)
+        async with semaphore:
+            try:
+                images = await get_ext_images(skin_name)
+            except Exception:
+                logger.exception("Failed to get images for %s", skin_name)
+                return 0
+
+        ext_images = match_ext_images(((row.id, row.ext) for row in skin_rows), images)
+        async with session_pool() as session:
+            await save_ext_images(session, ext_images)
+        return len(ext_images)
+
+    stored = await asyncio.gather(
+        *(
+            backfill_skin(list(skin_rows))
+            for _, skin_rows in groupby(rows, key=lambda row: row.skin_id)
+        )
+    )
+    logger.info("Stored %s of %s missing images", sum(stored), len(rows))
+    return sum(stored)
+
+
+async def main():
+    """Runs the backfill once against the configured database."""
+    engine = create_engine()
+    await open_http_session()
+    try:
+        await backfill_images(async_sessionmaker(bind=engine))
+    finally:
+        await close_http_session()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,193 @@
+"""
+Background warming of exterior slider payloads for skins a user is likely to open next.
+
+While a user browses the skin slider, the skin on screen and its neighbours are put into a
+bounded queue, and a few worker tasks build their exterior payloads (images and prices)
+into the shared payload cache, so the exterior slider usually opens without waiting for
+cs.money. Requests of a user are replaced when the user moves on and dropped when the user
+leaves the slider, and the queue drops new requests instead of growing when it is full.
+
+Classes:
+    - Prefetcher: Queue and workers that warm payloads of skins requested by users.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine, Iterable
+from typing import Any
+
+from bot.data import config
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """
+    Warms payloads of skins near the current position of each user.
+
+    Attributes:
+        queue_size (int): The maximum number of queued skins.
+        concurrency (int): The number of payloads warmed at the same time.
+        scheduled (int): Number of skins put into the queue.
+        dropped (int): Number of skins not queued because the queue was full.
+        cancelled (int): Number of queued or running warm-ups skipped or cancelled.
+        warmed (int): Number of finished warm-ups.
+    """
+
+    def __init__(self, queue_size: int, concurrency: int):
+        """
+        Initializes a prefetcher that is not started.
+
+        Args:
+            queue_size (int): The maximum number of queued skins.
+            concurrency (int): The number of payloads warmed at the same time.
+        """
+        self.queue_size = queue_size
+        self.concurrency = concurrency
+        self.scheduled = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.warmed = 0
+        self._queue: asyncio.Queue[tuple[int, int]] | None = None
+        self._workers: list[asyncio.Task] = []
+        # Skins of each user that are queued or being warmed, and the running warm-ups.
+        self._wanted: dict[int, set[int]] = {}
+        self._running: dict[int, asyncio.Task] = {}
+
+    def start(self, warm: Callable[[int], Coroutine[Any, Any, object]]):
+        """
+        Starts the worker tasks.
+
+        Args:
+            warm (Callable): A coroutine function that builds and caches the payload of
+                the skin with the given ID.
+        """
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._work(self._queue, warm), name=f"prefetch-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        """Cancels the worker tasks and running warm-ups and drops queued skins."""
+        tasks = [*self._workers, *self._running.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._running.clear()
+        self._wanted.clear()
+        self._queue = None
+
+    def stats(self) -> dict:
+        """
+        Returns counters of the prefetcher.
+
+        Returns:
+            dict: Numbers of scheduled, dropped, cancelled and warmed skins, and the
+            current queue length.
+        """
+        return {
+            "scheduled": self.scheduled,
+            "dropped": self.dropped,
+            "cancelled": self.cancelled,
+            "warmed": self.warmed,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    def schedule(self, user_id: int, skin_ids: Iterable[int]):
+        """
+        Replaces the skins warmed for a user.
+
+        Skins are warmed in the given order. Queued skins the user no longer wants are
+        skipped, and a running warm-up of such a skin is cancelled unless another user
+        wants it too. Does nothing if the prefetcher is not started.
+
+        Args:
+            user_id (int): The ID of the user.
+            skin_ids (Iterable[int]): IDs of the skins to warm, the most likely first.
+        """
+        if self._queue is None:
+            return
+
+        skin_ids = list(dict.fromkeys(skin_ids))
+        previous = self._wanted.pop(user_id, set())
+        if skin_ids:
+            self._wanted[user_id] = set(skin_ids)
+        self._cancel_unwanted(previous - set(skin_ids))
+
+        for skin_id in skin_ids:
+            if skin_id in previous or skin_id in self._running:
+                continue
+            try:
+                self._queue.put_nowait((user_id, skin_id))
+            except asyncio.QueueFull:
+                self._forget(user_id, skin_id)
+                self.dropped += 1
+            else:
+                self.scheduled += 1
+
+    def cancel(self, user_id: int):
+        """
+        Drops the skins warmed for a user, e.g. when the user leaves the slider.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        self._cancel_unwanted(self._wanted.pop(user_id, set()))
+
+    def _forget(self, user_id: int, skin_id: int):
+        skin_ids = self._wanted.get(user_id)
+        if skin_ids is not None:
+            skin_ids.discard(skin_id)
+            if not skin_ids:
+                del self._wanted[user_id]
+
+    def _is_wanted(self, skin_id: int) -> bool:
+        return any(skin_id in skin_ids for skin_ids in self._wanted.values())
+
+    def _cancel_unwanted(self, skin_ids: set[int]):
+        for skin_id in skin_ids:
+            task = self._running.get(skin_id)
+            if task is not None and not self._is_wanted(skin_id):
+                task.cancel()
+
+    async def _work(
+        self,
+        queue: asyncio.Queue[tuple[int, int]],
+        warm: Callable[[int], Coroutine[Any, Any, object]],
+    ):
+        while True:
+            user_id, skin_id = await queue.get()
+            try:
+                if skin_id not in self._wanted.get(user_id, ()):
+                    self.cancelled += 1
+                    continue
+                if skin_id in self._running:
+                    # Another user's request is warming it already.
+                    self._forget(user_id, skin_id)
+                    continue
+
+                task = asyncio.create_task(warm(skin_id))
+                self._running[skin_id] = task
+                try:
+                    await asyncio.wait([task])
+                finally:
+                    self._running.pop(skin_id, None)
+                    self._forget(user_id, skin_id)
+
+                if task.cancelled():
+                    self.cancelled += 1
+                elif task.exception() is not None:
+                    logger.warning(
+                        "Failed to prefetch skin %s: %r", skin_id, task.exception()
+                    )
+                else:
+                    self.warmed += 1
+            finally:
+                queue.task_done()
+
+
+prefetcher = Prefetcher(
+    queue_size=config.PREFETCH_QUEUE_SIZE, concurrency=config.PREFETCH_CONCURRENCY
+)
@@ -0,0 +1,115 @@
+"""
+Background refresher of exterior prices.
+
+Walks every Exterior in chunks ordered by id, requests prices for all of their
+price_id/spec_price_id values with one price_trader_log call per chunk and upserts them
+into the prices table. get_ext_data then reads prices from Postgres instead of cs.money.
+
+Functions:
+    - refresh_prices: Refreshes prices of all exteriors once.
+"""
+
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from bot.data import config
+from bot.db.models import Exterior as Ext
+from bot.db.models import Price
+from bot.exceptions import ApiRequestError, CircuitOpenError
+from bot.utils.api.breaker import cs_money_batch_breaker
+from bot.utils.api.skins import get_ext_prices
+from bot.utils.cache.prices import price_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_prices(
+    session_pool: async_sessionmaker, chunk_size: int = config.PRICE_REFRESH_CHUNK_SIZE
+) -> int:
+    """
+    Refreshes prices of all exteriors once.
+
+    Each chunk is committed separately. If the prices of a chunk could not be requested,
+    the error is logged and the refresh goes on with the next chunk, keeping the stored
+    prices of the failed one. Requests go through the batch cs.money circuit breaker, and
+    the refresh stops when it is open, since the remaining chunks would be rejected too. Fetched prices are also stored in the
+    shared price cache.
+
+    Args:
+        session_pool (async_sessionmaker): The session maker for database connections.
+        chunk_size (int): The number of exteriors requested from cs.money at once.
+
+    Returns:
+        int: The number of stored prices.
+
+    Raises:
+        CircuitOpenError: If the batch cs.money circuit is open.
+    """
+    last_id = 0
+    stored = 0
+    failed = 0
+
+    while True:
+        async with session_pool() as session:
+            sql_query = (
+                select(Ext.id, Ext.price_id, Ext.spec_price_id)
+                .where(Ext.id > last_id)
+                .order_by(Ext.id)
+                .limit(chunk_size)
+            )
+            rows = (await session.execute(sql_query)).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        name_ids = list(
+            dict.fromkeys(
+                name_id
+                for row in rows
+                for name_id in (row.price_id, row.spec_price_id)
+                if name_id
+            )
+        )
+        if not name_ids:
+            continue
+
+        # The database connection is not held while waiting for cs.money.
+        try:
+            prices = await get_ext_prices(name_ids, breaker=cs_money_batch_breaker)
+        except CircuitOpenError:
+            logger.warning("Stopped after storing %s prices, cs.money is down", stored)
+            raise
+        except ApiRequestError as err:
+            failed += 1
+            logger.warning(
+                "Failed to refresh prices of exteriors up to %s: %s", last_id, err
+            )
+            continue
+        if prices:
+            fetched_at = datetime.now(timezone.utc)
+            sql_upsert = insert(Price).values(
+                [
+                    {"name_id": name_id, "price": price, "fetched_at": fetched_at}
+                    for name_id, price in prices.items()
+                ]
+            )
+            sql_upsert = sql_upsert.on_conflict_do_update(
+                index_elements=[Price.name_id],
+                set_={
+                    "price": sql_upsert.excluded.price,
+                    "fetched_at": sql_upsert.excluded.fetched_at,
+                },
+            )
+            async with session_pool() as session:
+                await session.execute(sql_upsert)
+                await session.commit()
+            stored += len(prices)
+
+        await price_cache.store(prices, name_ids)
+
+    logger.info("Stored %s prices, %s chunks failed", stored, failed)
+    return stored
@@ -0,0 +1,48 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(
+    interval: float, job: Callable[[], Awaitable[object]], name: str
+):
+    """
+    Runs a job forever with a fixed pause between runs.
+
+    Failures are logged and do not stop the loop, so a temporary outage of an external
+    API only delays the next successful run. Cancel the task to stop the loop.
+
+    Args:
+        interval (float): Seconds to wait after each run.
+        job (Callable): A coroutine function without arguments to run.
+        name (str): The name of the job used in log messages.
+    """
+    while True:
+        started = asyncio.get_running_loop().time()
+        try:
+            await job()
+        except Exception:
+            logger.exception("Job %s failed", name)
+        else:
+            elapsed = asyncio.get_running_loop().time() - started
+            logger.info("Job %s finished in %.1fs", name, elapsed)
+        await asyncio.sleep(interval)
+
+
+def start_job(
+    interval: float, job: Callable[[], Awaitable[object]], name: str
+) -> asyncio.Task:
+    """
+    Starts a periodic job in a background task.
+
+    Args:
+        interval (float): Seconds to wait after each run.
+        job (Callable): A coroutine function without arguments to run.
+        name (str): The name of the job and of the task.
+
+    Returns:
+        asyncio.Task: The task running the job, cancel it on shutdown.
+    """
+    return asyncio.create_task(run_periodically(interval, job, name), name=name)
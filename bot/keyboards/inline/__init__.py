@@ -1,3 +1,4 @@
+from .cache import get_cached_categories, get_cached_sub_cats
 from .category import get_categories
 from .payment import get_payment_methods
 from .skin_type import get_skin_types
@@ -7,6 +8,8 @@ from .sub_category import get_sub_cats
 __all__ = [
     "get_categories",
     "get_sub_cats",
+    "get_cached_categories",
+    "get_cached_sub_cats",
     "get_skin_slider_menu",
     "get_ext_slider_menu",
     "get_payment_methods",
@@ -0,0 +1,63 @@
+from collections.abc import Callable
+
+from aiogram.types import InlineKeyboardMarkup
+
+from bot.db.catalog import Catalog
+
+from .category import get_categories
+from .sub_category import get_sub_cats
+
+# Ready keyboards keyed by (menu, id, catalog version). Keyboards of catalog menus only
+# depend on catalog content, so they are built (and their callbacks packed) once.
+_keyboards: dict[tuple[str, int, int], InlineKeyboardMarkup] = {}
+
+
+def _get_cached(
+    menu: str, key_id: int, version: int, build: Callable[[], InlineKeyboardMarkup]
+) -> InlineKeyboardMarkup:
+    key = (menu, key_id, version)
+    markup = _keyboards.get(key)
+    if markup is None:
+        # Keyboards of a previous catalog version will never be requested again.
+        if any(cached_key[2] != version for cached_key in _keyboards):
+            _keyboards.clear()
+        markup = _keyboards[key] = build()
+    return markup
+
+
+def get_cached_categories(catalog: Catalog) -> InlineKeyboardMarkup:
+    """
+    Returns the keyboard for browsing categories of the catalog.
+
+    The keyboard is built with get_categories once per catalog version.
+
+    Args:
+        catalog (Catalog): The current catalog snapshot.
+
+    Returns:
+        InlineKeyboardMarkup: The keyboard with category buttons.
+    """
+    return _get_cached(
+        "categories", 0, catalog.version, lambda: get_categories(catalog.categories)
+    )
+
+
+def get_cached_sub_cats(catalog: Catalog, cat_id: int) -> InlineKeyboardMarkup:
+    """
+    Returns the keyboard for sub-categories of a category.
+
+    The keyboard is built with get_sub_cats once per category and catalog version.
+
+    Args:
+        catalog (Catalog): The current catalog snapshot.
+        cat_id (int): The ID of the category.
+
+    Returns:
+        InlineKeyboardMarkup: The keyboard with sub-category buttons.
+    """
+    return _get_cached(
+        "sub_categories",
+        cat_id,
+        catalog.version,
+        lambda: get_sub_cats(cat_id=cat_id, data=catalog.get_sub_categories(cat_id)),
+    )
@@ -1,11 +1,48 @@
-from aiogram import Dispatcher
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from functools import partial
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.base import BaseSession
 from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.utils.callback_answer import CallbackAnswerMiddleware
+from redis.asyncio.client import Redis
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from bot.data import config
+from bot.db.catalog import catalog_sync, load_catalog
+from bot.db.engine import create_engine, get_pool_stats
+from bot.handlers.admin import admin_routers
 from bot.handlers.user import user_routers
-from bot.middlewares import DbSessionMiddleware
+from bot.handlers.user.callbacks.ext_slider import warm_ext_payload
+from bot.jobs.prefetch import prefetcher
+from bot.jobs.prices import refresh_prices
+from bot.jobs.scheduler import start_job
+from bot.middlewares import (
+    DbSessionMiddleware,
+    FileIdMiddleware,
+    HandlerMetricsMiddleware,
+    RateLimitMiddleware,
+    SliderThrottleMiddleware,
+    UpdateMetricsMiddleware,
+)
+from bot.utils.api.breaker import cs_money_batch_breaker, cs_money_breaker
+from bot.utils.api.client import close_http_session, open_http_session
+from bot.utils.api.single_flight import single_flight
+from bot.utils.cache.ext_payload import ext_payload_cache
+from bot.utils.cache.file_ids import file_id_cache
+from bot.utils.cache.prices import price_cache
+from bot.utils.cache.rates import exchange_rates
+from bot.utils.metrics import (
+    InstrumentedStorage,
+    instrument_engine,
+    register_collector,
+    start_metrics_server,
+    unregister_collector,
+)
 
 
 def get_dispatcher(
@@ -23,10 +60,167 @@ def get_dispatcher(
     """
     dp = Dispatcher(storage=storage)
 
-    dp.update.middleware(DbSessionMiddleware(session_pool=session_pool))
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    # Inner middlewares, so the session is only opened once a handler that needs it matched.
+    handler_metrics_middleware = HandlerMetricsMiddleware()
+    db_session_middleware = DbSessionMiddleware(session_pool=session_pool)
+    for observer in (dp.message, dp.callback_query, dp.pre_checkout_query):
+        observer.middleware(handler_metrics_middleware)
+        observer.middleware(db_session_middleware)
     dp.callback_query.middleware(CallbackAnswerMiddleware())
+    dp.callback_query.middleware(SliderThrottleMiddleware())
 
-    for router in user_routers:
+    for router in (*admin_routers, *user_routers):
         dp.include_router(router)
 
     return dp
+
+
+@asynccontextmanager
+async def start_bot(
+    run_jobs: bool = True,
+    metrics_port: int = config.METRICS_PORT,
+    session: BaseSession | None = None,
+    redis: Redis | None = None,
+    db_url: str = config.POSTGRES_URI,
+) -> AsyncIterator[tuple[Bot, Dispatcher]]:
+    """
+    Sets up the bot and everything its handlers need, and tears it down on exit.
+
+    Steps:
+    1. Creates the async database engine and session maker, and loads the catalog snapshot,
+       which is reloaded whenever another process announces a reload.
+    2. Initializes the bot with default settings, Redis storage and Redis-backed caches,
+       makes the bot send already uploaded photos by file_id, and schedules its requests
+       within Telegram's rate limits.
+    3. Opens the shared HTTP client session for external APIs and starts the prefetcher
+       that warms exterior slider payloads.
+    4. Loads the last known exchange rates and starts background refreshers.
+    5. Instruments the database engine and FSM storage and starts the metrics server.
+    6. On exit, stops background jobs, the prefetcher and the metrics server, and closes the HTTP session
+       and database engine.
+
+    The Bot API session, Redis client and database can be replaced, e.g. by the load test.
+    External API endpoints are read from config when requests are sent.
+
+    Args:
+        run_jobs (bool): Whether to start background refreshers in this process.
+        metrics_port (int): The port of the metrics server, 0 to not start it.
+        session (BaseSession, optional): The session the bot sends Bot API requests with.
+            Defaults to an aiohttp session to Telegram.
+        redis (Redis, optional): The Redis client for FSM data and caches. Defaults to a
+            client of the configured Redis.
+        db_url (str): The database URL. Defaults to the configured Postgres URI.
+
+    Yields:
+        tuple[Bot, Dispatcher]: The bot instance and the configured dispatcher.
+    """
+    engine = create_engine(db_url)
+    instrument_engine(engine)
+    sessionmaker = async_sessionmaker(bind=engine)
+    default = DefaultBotProperties(parse_mode="HTML")
+    bot = Bot(token=config.BOT_TOKEN, session=session, default=default)
+
+    if redis is None:
+        redis = Redis(
+            host=config.REDIS_HOST, port=config.REDIS_PORT, db=config.REDIS_DB
+        )
+    storage = InstrumentedStorage(RedisStorage(redis=redis))
+    price_cache.bind(redis)
+    exchange_rates.bind(redis)
+    file_id_cache.bind(redis)
+    ext_payload_cache.bind(redis)
+    single_flight.bind(redis)
+    bot.session.middleware(FileIdMiddleware(cache=file_id_cache))
+    # Registered after FileIdMiddleware, so a repeated request with the URL waits too.
+    workers = config.WORKER_COUNT if config.BOT_MODE == "workers" else 1
+    rate_limit_middleware = RateLimitMiddleware(
+        global_rate=config.TELEGRAM_GLOBAL_RATE / workers,
+        chat_rate=config.TELEGRAM_CHAT_RATE,
+        chat_burst=config.TELEGRAM_CHAT_BURST,
+        group_rate=config.TELEGRAM_GROUP_RATE,
+        max_retries=config.TELEGRAM_MAX_RETRIES,
+    )
+    bot.session.middleware(rate_limit_middleware)
+
+    dp = get_dispatcher(storage=storage, session_pool=sessionmaker)
+
+    async with sessionmaker() as db_session:
+        await load_catalog(db_session)
+    catalog_sync.bind(redis, sessionmaker)
+    await catalog_sync.check()
+    await open_http_session()
+    prefetcher.start(partial(warm_ext_payload, sessionmaker))
+    await exchange_rates.load()
+    # Every process picks up catalog reloads announced by another one.
+    jobs = [
+        start_job(
+            interval=config.CATALOG_CHECK_INTERVAL,
+            job=catalog_sync.check,
+            name="check_catalog_reloads",
+        )
+    ]
+    if run_jobs:
+        jobs += [
+            start_job(
+                interval=config.EXCHANGE_RATE_CHECK_INTERVAL,
+                job=exchange_rates.refresh,
+                name="refresh_exchange_rates",
+            ),
+            start_job(
+                interval=config.PRICE_REFRESH_INTERVAL,
+                job=partial(refresh_prices, sessionmaker),
+                name="refresh_prices",
+            ),
+        ]
+    # Collectors of this bot's objects, replaced by the next start_bot in the same process.
+    collectors: list[tuple[str, str, Callable[[], dict[str, float]]]] = [
+        ("bot_price_cache", "Price cache hits and misses.", price_cache.stats),
+        (
+            "bot_api_single_flight",
+            "External API requests sent and shared between identical calls.",
+            single_flight.stats,
+        ),
+        (
+            "bot_cs_money_circuit",
+            "State of the cs.money circuit breaker.",
+            cs_money_breaker.stats,
+        ),
+        (
+            "bot_cs_money_batch_circuit",
+            "State of the cs.money circuit breaker of the price refresher.",
+            cs_money_batch_breaker.stats,
+        ),
+        (
+            "bot_telegram_queue",
+            "Bot API requests waiting for rate limit tokens.",
+            rate_limit_middleware.stats,
+        ),
+        ("bot_prefetch", "Exterior slider payload prefetching.", prefetcher.stats),
+        (
+            "bot_db_pool",
+            "Database pool checkouts and waits.",
+            partial(get_pool_stats, engine),
+        ),
+    ]
+    for name, help, collect in collectors:
+        register_collector(name, help, collect)
+    metrics_runner = None
+    if metrics_port:
+        metrics_runner = await start_metrics_server(config.METRICS_HOST, metrics_port)
+    try:
+        yield bot, dp
+    finally:
+        for job in jobs:
+            job.cancel()
+        for name, _, _ in collectors:
+            unregister_collector(name)
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        await prefetcher.stop()
+        await cs_money_breaker.close()
+        await cs_money_batch_breaker.close()
+        await rate_limit_middleware.close()
+        await close_http_session()
+        await bot.session.close()
+        await engine.dispose()
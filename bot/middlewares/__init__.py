@@ -1,3 +1,15 @@
 from .db import DbSessionMiddleware
+from .file_ids import FileIdMiddleware
+from .metrics import HandlerMetricsMiddleware, UpdateMetricsMiddleware
+from .rate_limit import RateLimitMiddleware, broadcast_priority
+from .throttling import SliderThrottleMiddleware
 
-__all__ = ["DbSessionMiddleware"]
+__all__ = [
+    "DbSessionMiddleware",
+    "FileIdMiddleware",
+    "HandlerMetricsMiddleware",
+    "RateLimitMiddleware",
+    "SliderThrottleMiddleware",
+    "UpdateMetricsMiddleware",
+    "broadcast_priority",
+]
@@ -1,16 +1,20 @@
 from typing import Any, Awaitable, Callable, Dict
 
 from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
 from aiogram.types import TelegramObject
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 
 class DbSessionMiddleware(BaseMiddleware):
     """
-    Middleware to provide a database session for each update.
+    Middleware to provide a database session to handlers that need one.
 
     This middleware injects a database session into the handler's data, allowing the handler
     to perform database operations. The session is automatically closed after the handler is executed.
+    It is meant to be registered as an inner middleware, so the matched handler is known: a session
+    is only opened for handlers that declare a `session` parameter, other updates (commands,
+    `back_*` and no-op callbacks) do not touch the connection pool.
 
     Attributes:
         session_pool (async_sessionmaker): The session maker for creating new database sessions.
@@ -33,7 +37,7 @@ class DbSessionMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         """
-        Middleware call method to provide a session to the handler.
+        Middleware call method to provide a session to the handler if it accepts one.
 
         Args:
             handler (Callable): The handler function to be called.
@@ -43,6 +47,10 @@ class DbSessionMiddleware(BaseMiddleware):
         Returns:
             Any: The result of the handler execution.
         """
+        handler_object: HandlerObject | None = data.get("handler")
+        if handler_object is not None and "session" not in handler_object.params:
+            return await handler(event, data)
+
         async with self.session_pool() as session:
             data["session"] = session
             return await handler(event, data)
@@ -0,0 +1,99 @@
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import EditMessageMedia, Response, SendPhoto, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import InputMediaPhoto, Message
+
+from bot.utils.cache.file_ids import FileIdCache
+
+
+class FileIdMiddleware(BaseRequestMiddleware):
+    """
+    Request middleware to send photos by Telegram file_id instead of by URL.
+
+    Applies to sendPhoto and editMessageMedia with InputMediaPhoto. The first time a URL is
+    sent, the file_id of the largest PhotoSize from the response is stored in the cache.
+    Later requests with the same URL send the file_id, so Telegram does not download the
+    photo again. If Telegram rejects a cached file_id, the request is repeated with the URL.
+
+    Attributes:
+        cache (FileIdCache): The map of photo URLs to file_ids.
+    """
+
+    def __init__(self, cache: FileIdCache):
+        """
+        Initializes the middleware with a file_id cache.
+
+        Args:
+            cache (FileIdCache): The map of photo URLs to file_ids.
+        """
+        self.cache = cache
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        """
+        Middleware call method to replace photo URLs with cached file_ids.
+
+        Args:
+            make_request (NextRequestMiddlewareType): The next request handler in the chain.
+            bot (Bot): The bot instance making the request.
+            method (TelegramMethod): The Bot API method being requested.
+
+        Returns:
+            Response: The response of the Bot API.
+        """
+        url = self._get_photo_url(method)
+        if url is None:
+            return await make_request(bot, method)
+
+        if file_id := await self.cache.get(url):
+            try:
+                return await make_request(bot, self._replace_photo(method, file_id))
+            except TelegramBadRequest as err:
+                if "file" not in err.message.lower():
+                    raise
+                await self.cache.forget(url)
+
+        # Despite the annotation, the request chain returns the method result itself.
+        response = await make_request(bot, method)
+        result: Any = response
+        match result:
+            case Message(photo=[*_, largest]):
+                await self.cache.set(url, largest.file_id)
+        return response
+
+    @staticmethod
+    def _get_photo_url(method: TelegramMethod[Any]) -> str | None:
+        if isinstance(method, SendPhoto):
+            photo = method.photo
+        elif isinstance(method, EditMessageMedia) and isinstance(
+            method.media, InputMediaPhoto
+        ):
+            photo = method.media.media
+        else:
+            return None
+
+        if isinstance(photo, str) and photo.startswith(("http://", "https://")):
+            return photo
+        return None
+
+    @staticmethod
+    def _replace_photo(method: TelegramMethod[Any], file_id: str) -> Any:
+        match method:
+            case SendPhoto():
+                return method.model_copy(update={"photo": file_id})
+            case EditMessageMedia(media=InputMediaPhoto() as media):
+                return method.model_copy(
+                    update={"media": media.model_copy(update={"media": file_id})}
+                )
+        return method
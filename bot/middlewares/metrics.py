@@ -0,0 +1,72 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Router
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject, Update
+
+from bot.utils.metrics import HANDLER_LATENCY, UPDATES
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """
+    Outer middleware for updates to count received updates by type.
+
+    Register it on dp.update.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """
+        Middleware call method to count the update.
+
+        Args:
+            handler (Callable): The handler function to be called.
+            event (TelegramObject): The Telegram event that triggered the handler.
+            data (Dict[str, Any]): The data dictionary passed to the handler.
+
+        Returns:
+            Any: The result of the handler execution.
+        """
+        if isinstance(event, Update):
+            UPDATES.inc(event.event_type)
+        return await handler(event, data)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Inner middleware to measure handler execution time by router and handler.
+
+    Register it as an inner middleware of the dispatcher's event observers, it then
+    applies to handlers of all included routers.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """
+        Middleware call method to measure the handler execution time.
+
+        Args:
+            handler (Callable): The handler function to be called.
+            event (TelegramObject): The Telegram event that triggered the handler.
+            data (Dict[str, Any]): The data dictionary passed to the handler.
+
+        Returns:
+            Any: The result of the handler execution.
+        """
+        router: Router | None = data.get("event_router")
+        handler_object: HandlerObject | None = data.get("handler")
+        router_name = router.name if router is not None else ""
+        handler_name = (
+            getattr(handler_object.callback, "__name__", "") if handler_object else ""
+        )
+
+        with HANDLER_LATENCY.time(router_name, handler_name):
+            return await handler(event, data)
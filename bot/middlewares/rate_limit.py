@@ -0,0 +1,336 @@
+"""
+Outbound Bot API scheduling within Telegram's rate limits.
+
+Requests that target a chat wait for a token of a global bucket and of the bucket of their
+chat before they are sent, instead of being sent at once and rejected with 429. Waiting
+requests take global tokens in order of priority: interactive requests made while handling
+an update go before broadcasts, which are marked with broadcast_priority. A 429 that still
+happens pauses the bucket it belongs to and the request is repeated after retry_after.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from bot.utils.metrics import TELEGRAM_QUEUE_WAIT, TELEGRAM_RETRY_AFTER
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BROADCAST = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BROADCAST: "broadcast"}
+
+# Idle chat buckets are dropped once there are more than this many.
+MAX_IDLE_CHAT_BUCKETS = 10000
+
+_priority: ContextVar[int] = ContextVar("telegram_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def broadcast_priority() -> Iterator[None]:
+    """Sends Bot API requests made inside the block after interactive ones."""
+    token = _priority.set(BROADCAST)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Token bucket that lets callers reserve tokens ahead of time.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): The maximum number of tokens, i.e. the allowed burst.
+        tokens (float): Available tokens, negative when tokens are reserved ahead.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float): The maximum number of tokens.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def delay(self) -> float:
+        """
+        Returns seconds until a token is available.
+
+        Returns:
+            float: 0 if a token is available now.
+        """
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def reserve(self) -> float:
+        """
+        Takes a token, possibly one that is not available yet.
+
+        Returns:
+            float: Seconds to wait until the taken token is available.
+        """
+        self._refill()
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def pause(self, seconds: float):
+        """
+        Makes the next token available not earlier than in the given time.
+
+        Args:
+            seconds (float): Seconds without tokens.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+    def is_idle(self) -> bool:
+        """
+        Returns whether the bucket is full, i.e. nobody used it recently.
+
+        Returns:
+            bool: True if the bucket is full.
+        """
+        self._refill()
+        return self.tokens >= self.capacity
+
+
+class PriorityLimiter:
+    """
+    Hands out tokens of a bucket to waiting callers in order of priority.
+
+    Attributes:
+        bucket (TokenBucket): The bucket tokens are taken from.
+    """
+
+    def __init__(self, bucket: TokenBucket):
+        """
+        Initializes a limiter without waiting callers.
+
+        Args:
+            bucket (TokenBucket): The bucket tokens are taken from.
+        """
+        self.bucket = bucket
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def waiting(self) -> dict[int, int]:
+        """
+        Returns the number of waiting callers by priority.
+
+        Returns:
+            dict: Numbers of callers that wait for a token by priority.
+        """
+        counts = dict.fromkeys(PRIORITY_NAMES, 0)
+        for priority, _, future in self._waiters:
+            if not future.done():
+                counts[priority] += 1
+        return counts
+
+    async def acquire(self, priority: int):
+        """
+        Waits for a token, lower priority values are served first.
+
+        Args:
+            priority (int): The priority of the caller, INTERACTIVE or BROADCAST.
+        """
+        if not self._waiters and self.bucket.delay() == 0:
+            self.bucket.reserve()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._serve())
+        await future
+
+    async def close(self):
+        """Stops handing out tokens and cancels all waiting callers."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        for _, _, future in self._waiters:
+            future.cancel()
+        self._waiters.clear()
+
+    async def _serve(self):
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                # The caller was cancelled while waiting.
+                heapq.heappop(self._waiters)
+                continue
+            if delay := self.bucket.delay():
+                await asyncio.sleep(delay)
+                continue
+            heapq.heappop(self._waiters)
+            self.bucket.reserve()
+            future.set_result(None)
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Request middleware that keeps requests to chats within Telegram's rate limits.
+
+    Applies to Bot API methods with a chat_id (sending, editing and deleting messages,
+    invoices, etc.). Each request takes a token of the global bucket, in order of priority,
+    and a token of its chat's bucket, in order of arrival. Group chats get a lower rate.
+
+    Attributes:
+        limiter (PriorityLimiter): The limiter of the global bucket.
+        chat_rate (float): Requests per second to a private chat.
+        chat_burst (float): Requests to a private chat sent without waiting.
+        group_rate (float): Requests per second to a group chat.
+        max_retries (int): How many times a request rejected with 429 is repeated.
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        chat_burst: float,
+        group_rate: float,
+        max_retries: int,
+    ):
+        """
+        Initializes the middleware with full buckets.
+
+        Args:
+            global_rate (float): Requests per second to all chats together.
+            chat_rate (float): Requests per second to a private chat.
+            chat_burst (float): Requests to a private chat sent without waiting.
+            group_rate (float): Requests per second to a group chat.
+            max_retries (int): How many times a request rejected with 429 is repeated.
+        """
+        self.limiter = PriorityLimiter(TokenBucket(global_rate, global_rate))
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+        self._chat_buckets: dict[int | str, TokenBucket] = {}
+        self._chat_waiting = 0
+
+    def stats(self) -> dict:
+        """
+        Returns queue depths of the scheduler.
+
+        Returns:
+            dict: Numbers of requests waiting for a global token by priority, requests
+            waiting for a chat token, and chats with a bucket.
+        """
+        waiting = self.limiter.waiting()
+        return {
+            **{PRIORITY_NAMES[p]: count for p, count in waiting.items()},
+            "chat_waiting": self._chat_waiting,
+            "chats": len(self._chat_buckets),
+        }
+
+    async def close(self):
+        """Cancels requests waiting for a global token."""
+        await self.limiter.close()
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        """
+        Middleware call method to wait for tokens before the request is sent.
+
+        Args:
+            make_request (NextRequestMiddlewareType): The next request handler in the chain.
+            bot (Bot): The bot instance making the request.
+            method (TelegramMethod): The Bot API method being requested.
+
+        Returns:
+            Response: The response of the Bot API.
+
+        Raises:
+            TelegramRetryAfter: If the request was still rejected after max_retries.
+        """
+        if "chat_id" not in type(method).model_fields:
+            return await make_request(bot, method)
+
+        chat_id: Any = getattr(method, "chat_id", None)
+        priority = _priority.get()
+        attempt = 0
+        while True:
+            await self._acquire(chat_id, priority)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as err:
+                TELEGRAM_RETRY_AFTER.inc(method.__api_method__)
+                if chat_id is not None:
+                    self._get_chat_bucket(chat_id).pause(err.retry_after)
+                else:
+                    self.limiter.bucket.pause(err.retry_after)
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                logger.warning(
+                    "%s to chat %s hit the rate limit, retrying in %ss",
+                    method.__api_method__,
+                    chat_id,
+                    err.retry_after,
+                )
+
+    async def _acquire(self, chat_id: int | str | None, priority: int):
+        start = time.perf_counter()
+        if chat_id is not None:
+            if delay := self._get_chat_bucket(chat_id).reserve():
+                self._chat_waiting += 1
+                try:
+                    await asyncio.sleep(delay)
+                finally:
+                    self._chat_waiting -= 1
+        await self.limiter.acquire(priority)
+        TELEGRAM_QUEUE_WAIT.observe(
+            time.perf_counter() - start, PRIORITY_NAMES[priority]
+        )
+
+    def _get_chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= MAX_IDLE_CHAT_BUCKETS:
+                self._chat_buckets = {
+                    key: value
+                    for key, value in self._chat_buckets.items()
+                    if not value.is_idle()
+                }
+            # Private chats have positive IDs, groups and channels negative ones or @username.
+            if isinstance(chat_id, int) and chat_id > 0:
+                bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            else:
+                bucket = TokenBucket(self.group_rate, 1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
@@ -0,0 +1,71 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, TelegramObject
+
+from bot.utils.metrics import SLIDER_CLICKS_COALESCED
+
+# Position change of each slider navigation button.
+SLIDER_DELTAS = {"prev_skin": -1, "next_skin": 1, "prev_ext": -1, "next_ext": 1}
+
+
+class SliderThrottleMiddleware(BaseMiddleware):
+    """
+    Inner middleware to coalesce rapid slider navigation clicks of a user.
+
+    The first prev/next click on a slider message is handled at once. Clicks on the same
+    message that arrive while it is handled are not handled on their own: their position
+    changes are summed up, and the handler runs once more with the net change after it
+    finishes. The handler receives the position change as slider_delta.
+
+    Register it on dp.callback_query after CallbackAnswerMiddleware, so superseded clicks
+    are answered too.
+    """
+
+    def __init__(self):
+        # Position change of clicks that arrived while the handler was running, by user
+        # and slider message. A key is present while a click on the message is handled.
+        self._pending: dict[tuple[int, int | str], int] = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """
+        Middleware call method to coalesce slider navigation clicks.
+
+        Args:
+            handler (Callable): The handler function to be called.
+            event (TelegramObject): The Telegram event that triggered the handler.
+            data (Dict[str, Any]): The data dictionary passed to the handler.
+
+        Returns:
+            Any: The result of the last handler run, or None for a superseded click.
+        """
+        if not isinstance(event, CallbackQuery) or event.data not in SLIDER_DELTAS:
+            return await handler(event, data)
+
+        delta = SLIDER_DELTAS[event.data]
+        message_id = (
+            event.message.message_id if event.message else event.inline_message_id
+        )
+        key = (event.from_user.id, message_id or "")
+
+        if key in self._pending:
+            self._pending[key] += delta
+            SLIDER_CLICKS_COALESCED.inc()
+            return None
+
+        self._pending[key] = 0
+        try:
+            data["slider_delta"] = delta
+            result = await handler(event, data)
+            # Clicks in opposite directions may cancel out, then there is nothing to show.
+            while self._pending[key]:
+                data["slider_delta"], self._pending[key] = self._pending[key], 0
+                result = await handler(event, data)
+            return result
+        finally:
+            del self._pending[key]
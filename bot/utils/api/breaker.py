@@ -0,0 +1,190 @@
+"""
+Circuit breaker for external APIs.
+
+Requests go through the breaker while the API is healthy. After a number of consecutive
+failed or slow requests the breaker opens: further requests fail immediately with
+CircuitOpenError instead of waiting for timeouts, so callers can fall back to data they
+already have. While open, a background task periodically repeats the most recent request
+and closes the breaker once it succeeds in time.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from bot.data import config
+from bot.exceptions import ApiRequestError, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Fails requests to an unhealthy API fast and probes it for recovery in the background.
+
+    Attributes:
+        name (str): The name of the API used in errors and log messages.
+        failure_threshold (int): Consecutive failed or slow requests that open the breaker.
+        slow_call_duration (float): Seconds after which a successful request counts as slow.
+        timeout (float): Seconds after which a request is cancelled and counted as failed.
+        probe_interval (float): Seconds between recovery probes while the breaker is open.
+        failures (int): The current number of consecutive failed or slow requests.
+        trips (int): Number of times the breaker opened.
+        rejected (int): Number of requests rejected while the breaker was open.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        slow_call_duration: float,
+        timeout: float,
+        probe_interval: float,
+    ):
+        """
+        Initializes a closed breaker.
+
+        Args:
+            name (str): The name of the API used in errors and log messages.
+            failure_threshold (int): Consecutive failed or slow requests that open the breaker.
+            slow_call_duration (float): Seconds after which a request counts as slow.
+            timeout (float): Seconds after which a request is cancelled and counted as failed.
+            probe_interval (float): Seconds between recovery probes while the breaker is open.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_duration = slow_call_duration
+        self.timeout = timeout
+        self.probe_interval = probe_interval
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._probe_request: Callable[[], Awaitable[Any]] | None = None
+        self._probe_task: asyncio.Task | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """bool: Whether requests are currently rejected."""
+        return self._probe_task is not None
+
+    def stats(self) -> dict:
+        """
+        Returns the state and counters of the breaker.
+
+        Returns:
+            dict: Whether the breaker is open, consecutive failures, trips and rejected
+            requests.
+        """
+        return {
+            "open": int(self.is_open),
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+    async def call(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Sends a request through the breaker.
+
+        Args:
+            request (Callable): A coroutine function that sends the request. It may be
+                called again later to probe the API for recovery.
+
+        Returns:
+            Any: The result of the request.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+            ApiRequestError: If the request fails or takes longer than the timeout.
+        """
+        if self.is_open:
+            self.rejected += 1
+            self._probe_request = request
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        try:
+            result, duration = await self._send(request)
+        except ApiRequestError:
+            self._record_failure(request)
+            raise
+
+        if duration > self.slow_call_duration:
+            logger.warning("%s request took %.1fs", self.name, duration)
+            self._record_failure(request)
+        else:
+            self.failures = 0
+        return result
+
+    async def close(self):
+        """Stops probing and closes the breaker, e.g. on shutdown."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            await asyncio.gather(self._probe_task, return_exceptions=True)
+        self._probe_task = None
+        self._probe_request = None
+        self.failures = 0
+
+    async def _send(self, request: Callable[[], Awaitable[Any]]) -> tuple[Any, float]:
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                result = await request()
+        except TimeoutError as err:
+            raise ApiRequestError(
+                f"{self.name} request timed out after {self.timeout}s"
+            ) from err
+        return result, time.perf_counter() - start
+
+    def _record_failure(self, request: Callable[[], Awaitable[Any]]):
+        self.failures += 1
+        if self.failures < self.failure_threshold or self.is_open:
+            return
+
+        self.trips += 1
+        self._probe_request = request
+        self._probe_task = asyncio.create_task(
+            self._probe(request), name=f"probe-{self.name}"
+        )
+        logger.error(
+            "%s circuit opened after %s failed or slow requests",
+            self.name,
+            self.failures,
+        )
+
+    async def _probe(self, request: Callable[[], Awaitable[Any]]):
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            # Repeat the most recent rejected request, it is what users wait for.
+            request = self._probe_request or request
+            try:
+                _, duration = await self._send(request)
+            except ApiRequestError as err:
+                logger.info("%s is still unavailable: %s", self.name, err)
+                continue
+            if duration <= self.slow_call_duration:
+                break
+            logger.info("%s is still slow: %.1fs", self.name, duration)
+
+        self._probe_task = None
+        self._probe_request = None
+        self.failures = 0
+        logger.info("%s circuit closed", self.name)
+
+
+cs_money_breaker = CircuitBreaker(
+    name="cs.money",
+    failure_threshold=config.CS_MONEY_FAILURE_THRESHOLD,
+    slow_call_duration=config.CS_MONEY_SLOW_CALL_DURATION,
+    timeout=config.CS_MONEY_TIMEOUT,
+    probe_interval=config.CS_MONEY_PROBE_INTERVAL,
+)
+
+cs_money_batch_breaker = CircuitBreaker(
+    name="cs.money batch",
+    failure_threshold=config.CS_MONEY_FAILURE_THRESHOLD,
+    slow_call_duration=config.CS_MONEY_BATCH_SLOW_CALL_DURATION,
+    timeout=config.CS_MONEY_BATCH_TIMEOUT,
+    probe_interval=config.CS_MONEY_PROBE_INTERVAL,
+)
@@ -0,0 +1,134 @@
+"""
+Shared HTTP client for external APIs.
+
+A single aiohttp ClientSession with a keep-alive connection pool is opened on startup
+and closed on shutdown (see bot/main.py). All API helpers reuse it, so requests never
+block the event loop and TCP/TLS connections are not re-established for every call.
+
+Functions:
+    - open_http_session: Creates the shared client session with a connection pool.
+    - close_http_session: Closes the shared client session and its connections.
+    - get_http_session: Returns the shared client session.
+    - post_json: Sends a POST request with a JSON body and returns the decoded response.
+    - get_json: Sends a GET request and returns the decoded response.
+"""
+
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from bot.data import config
+from bot.exceptions import ApiRequestError
+from bot.utils.metrics import API_ERRORS, API_LATENCY
+
+UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+
+_session: aiohttp.ClientSession | None = None
+
+
+async def open_http_session() -> aiohttp.ClientSession:
+    """
+    Creates the shared client session with a keep-alive connection pool.
+
+    Calling it again while the session is open returns the existing session.
+
+    Returns:
+        aiohttp.ClientSession: The shared client session.
+    """
+    global _session
+
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=config.HTTP_POOL_SIZE,
+            keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT),
+            headers={"user-agent": UA},
+        )
+    return _session
+
+
+async def close_http_session():
+    """Closes the shared client session and releases all pooled connections."""
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Returns the shared client session.
+
+    Returns:
+        aiohttp.ClientSession: The shared client session.
+
+    Raises:
+        RuntimeError: If the session was not opened with open_http_session.
+    """
+    if _session is None or _session.closed:
+        raise RuntimeError("HTTP session is not opened, call open_http_session first")
+    return _session
+
+
+async def _request(method: str, url: str, **kwargs) -> Any:
+    host = URL(url).host or ""
+    try:
+        with API_LATENCY.time(host, method):
+            async with get_http_session().request(method, url, **kwargs) as response:
+                if response.status != 200:
+                    raise ApiRequestError(
+                        f"{method} {url} returned status {response.status}"
+                    )
+                return await response.json(content_type=None)
+    except (aiohttp.ClientError, TimeoutError) as err:
+        API_ERRORS.inc(host, method)
+        raise ApiRequestError(f"{method} {url} failed: {err!r}") from err
+    except ApiRequestError:
+        API_ERRORS.inc(host, method)
+        raise
+
+
+async def post_json(url: str, json_data: dict, timeout: float | None = None) -> Any:
+    """
+    Sends a POST request with a JSON body using the shared client session.
+
+    Args:
+        url (str): The URL to send the request to.
+        json_data (dict): The JSON body of the request.
+        timeout (float, optional): Seconds the request may take in total. Defaults to the
+            HTTP_TIMEOUT of the session.
+
+    Returns:
+        Any: The decoded JSON response.
+
+    Raises:
+        ApiRequestError: If the request fails or returns a non-200 status code.
+    """
+    if timeout is None:
+        return await _request("POST", url, json=json_data)
+    return await _request(
+        "POST", url, json=json_data, timeout=aiohttp.ClientTimeout(total=timeout)
+    )
+
+
+async def get_json(url: str, params: dict | None = None) -> Any:
+    """
+    Sends a GET request using the shared client session.
+
+    Args:
+        url (str): The URL to send the request to.
+        params (dict, optional): Query string parameters.
+
+    Returns:
+        Any: The decoded JSON response.
+
+    Raises:
+        ApiRequestError: If the request fails or returns a non-200 status code.
+    """
+    return await _request("GET", url, params=params)
@@ -0,0 +1,207 @@
+"""
+Coalescing of identical concurrent external API requests (single flight).
+
+Concurrent calls with the same key share one request: within a process the first caller
+sends it and the others wait for its future. Across bot processes the caller that takes a
+short Redis lock sends the request and publishes the response under a short-lived result
+key, other processes poll for it instead of sending their own request. If the lock holder
+fails or Redis is unreachable, waiting processes send the request themselves.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from redis.asyncio.client import Redis
+from redis.exceptions import LockError, RedisError
+
+from bot.data import config
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for a result published by another process.
+POLL_INTERVAL = 0.05
+
+
+def make_key(operation: str, *args: object) -> str:
+    """
+    Builds a coalescing key from an operation name and its arguments.
+
+    Args:
+        operation (str): The name of the API operation, e.g. "pattern_list".
+        *args (object): JSON-serializable arguments that identify the request.
+
+    Returns:
+        str: The operation name followed by a hash of the arguments.
+    """
+    digest = hashlib.sha1(
+        json.dumps(args, sort_keys=True).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"{operation}:{digest}"
+
+
+class SingleFlight:
+    """
+    Shares the result of one in-flight request between identical concurrent calls.
+
+    Attributes:
+        lock_ttl (float): Seconds the Redis lock of a request is held at most.
+        result_ttl (float): Seconds a published response is kept for other processes.
+        calls (int): Number of requests sent by this process.
+        shared (int): Number of calls that got the result of a request of this process.
+        remote_shared (int): Number of calls that got the result published by another process.
+    """
+
+    key_prefix = "single_flight:"
+
+    def __init__(self, lock_ttl: float, result_ttl: float):
+        """
+        Initializes a coalescer that is not bound to Redis.
+
+        Args:
+            lock_ttl (float): Seconds the Redis lock of a request is held at most.
+            result_ttl (float): Seconds a published response is kept for other processes.
+        """
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.redis: Redis | None = None
+        self.calls = 0
+        self.shared = 0
+        self.remote_shared = 0
+        self._flights: dict[str, asyncio.Future] = {}
+
+    def bind(self, redis: Redis):
+        """
+        Coalesces requests across processes through Redis.
+
+        Args:
+            redis (Redis): The Redis client to keep locks and results in.
+        """
+        self.redis = redis
+
+    def stats(self) -> dict:
+        """
+        Returns counters of sent and shared requests.
+
+        Returns:
+            dict: Numbers of sent requests, calls served by this process and calls
+            served by other processes.
+        """
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "remote_shared": self.remote_shared,
+        }
+
+    async def do(self, key: str, request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Sends a request unless an identical one is already in flight.
+
+        Args:
+            key (str): The key identifying the request, see make_key.
+            request (Callable): A coroutine function that sends the request and returns
+                a JSON-serializable response.
+
+        Returns:
+            Any: The response, possibly of a request sent by another caller.
+
+        Raises:
+            Exception: Any exception raised by request is passed to all waiting callers
+                of this process.
+        """
+        while (future := self._flights.get(key)) is not None:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The request was cancelled together with its caller, send it again.
+                if not future.cancelled():
+                    raise
+            else:
+                self.shared += 1
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        try:
+            result = await self._do_shared(key, request)
+            future.set_result(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # Mark the exception as retrieved when nobody else was waiting for it.
+            future.exception()
+            raise
+        finally:
+            del self._flights[key]
+        return result
+
+    async def _send(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        return await request()
+
+    async def _do_shared(self, key: str, request: Callable[[], Awaitable[Any]]) -> Any:
+        redis = self.redis
+        if redis is None:
+            return await self._send(request)
+
+        result_key = f"{self.key_prefix}result:{key}"
+        lock_key = f"{self.key_prefix}lock:{key}"
+        lock = redis.lock(lock_key, timeout=self.lock_ttl)
+        try:
+            acquired = await lock.acquire(blocking=False)
+            if not acquired:
+                found, value = await self._wait_result(redis, result_key, lock_key)
+                if found:
+                    self.remote_shared += 1
+                    return value
+        except RedisError:
+            logger.warning("Redis is unavailable, sending %s without a lock", key)
+            return await self._send(request)
+
+        if not acquired:
+            # The lock holder failed or took too long, send the request without the lock.
+            return await self._send(request)
+
+        try:
+            result = await self._send(request)
+            try:
+                await redis.set(
+                    result_key, json.dumps(result), px=int(self.result_ttl * 1000)
+                )
+            except RedisError:
+                logger.warning("Failed to publish the result of %s", key)
+            return result
+        finally:
+            try:
+                await lock.release()
+            except (LockError, RedisError):
+                # The lock expired or Redis went away, it is freed by its timeout then.
+                pass
+
+    async def _wait_result(
+        self, redis: Redis, result_key: str, lock_key: str
+    ) -> tuple[bool, Any]:
+        deadline = time.monotonic() + self.lock_ttl
+        while time.monotonic() < deadline:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.get(result_key)
+                pipe.exists(lock_key)
+                value, locked = await pipe.execute()
+            if value is not None:
+                return True, json.loads(value)
+            if not locked:
+                # The result is published before the lock is released, so it is gone.
+                return False, None
+            await asyncio.sleep(POLL_INTERVAL)
+        return False, None
+
+
+single_flight = SingleFlight(
+    lock_ttl=config.SINGLE_FLIGHT_LOCK_TTL, result_ttl=config.SINGLE_FLIGHT_RESULT_TTL
+)
@@ -1,33 +1,54 @@
-import requests
+from functools import partial
 
 from bot.data import config
+from bot.exceptions import ApiRequestError
+from bot.utils.api.breaker import CircuitBreaker, cs_money_breaker
+from bot.utils.api.client import get_json, post_json
+from bot.utils.api.single_flight import make_key, single_flight
 
 IMAGE_API_ENDPOINT = "https://pub-5f12f7508ff04ae5925853dee0438460.r2.dev/data/images"
-CURRENCY_API_ENDPOINT = "https://www.amdoren.com/api/currency.php"
-UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
 
-headers = {"user-agent": UA}
-cookies: dict = dict()
+
+def get_api_skin_name(skin_name: str, cat_id: int) -> str:
+    """
+    Returns the skin name in the form used by the cs.money API.
+
+    Skins of Knives and Gloves (categories 1 and 2) are prefixed with '★'.
+
+    Args:
+        skin_name (str): The name of the skin as stored in the database.
+        cat_id (int): The ID of the category the skin belongs to.
+
+    Returns:
+        str: The name of the skin for pattern_list requests.
+    """
+    return "★ " + skin_name if cat_id in [1, 2] else skin_name
 
 
-def get_ext_prices(ext_ids: list) -> dict:
+async def get_ext_prices(
+    ext_ids: list, breaker: CircuitBreaker = cs_money_breaker
+) -> dict:
     """
     Retrieves the most relevant trading prices for skins from the CS:GO market.
 
     This function sends a GraphQL request to retrieve the latest trader log prices
     for specified skin IDs, and returns the most recent price for each skin.
+    Concurrent calls for the same set of IDs share one request.
 
     Args:
         ext_ids (list): A list of skin API IDs to query prices for.
+        breaker (CircuitBreaker): The circuit breaker the request goes through, batch
+            requests use cs_money_batch_breaker.
 
     Returns:
         dict: A dictionary mapping each skin ID to its most recent price.
 
     Raises:
-        requests.exceptions.RequestException: If the request fails or returns a non-200 status code.
+        CircuitOpenError: If cs.money requests are suspended after repeated failures.
+        ApiRequestError: If the request fails, times out or returns a non-200 status code.
     """
 
-    ext_ids = [ext_id for ext_id in ext_ids if ext_id]
+    ext_ids = sorted({ext_id for ext_id in ext_ids if ext_id})
     json_data = {
         "operationName": "price_trader_log",
         "variables": {
@@ -44,31 +65,34 @@ def get_ext_prices(ext_ids: list) -> dict:
                     }""",
     }
 
-    response = requests.post(
-        "https://wiki.cs.money/api/graphql",
-        cookies=cookies,
-        headers=headers,
-        json=json_data,
-        timeout=10
+    response = await single_flight.do(
+        make_key("price_trader_log", ext_ids),
+        partial(
+            breaker.call,
+            # The session timeout would cut off batch requests before the breaker does.
+            partial(
+                post_json,
+                config.CS_MONEY_API_ENDPOINT,
+                json_data,
+                timeout=breaker.timeout,
+            ),
+        ),
     )
-    if response.status_code == 200:
-        data = response.json()["data"]["price_trader_log"]
-        result = {
-            price_obj["name_id"]: price_obj["values"][-1]["price_trader_new"]
-            for price_obj in data
-        }
-        return result
-    else:
-        print(f"Status code {response.status_code}")
-        raise requests.exceptions.RequestException
-
-
-def get_ext_images(skin_name: str) -> dict:
+    data = response["data"]["price_trader_log"]
+    result = {
+        price_obj["name_id"]: price_obj["values"][-1]["price_trader_new"]
+        for price_obj in data
+    }
+    return result
+
+
+async def get_ext_images(skin_name: str) -> dict:
     """
     Retrieves available patterns (images) for a specified skin.
 
     Sends a request to obtain all patterns of the specified skin, and
     returns one pattern image for each existing exterior (condition) of the skin.
+    Concurrent calls for the same skin share one request.
 
     Args:
         skin_name (str): The name of the skin to retrieve patterns for.
@@ -77,7 +101,8 @@ def get_ext_images(skin_name: str) -> dict:
         dict: A dictionary mapping each skin exterior to its corresponding pattern image URL.
 
     Raises:
-        requests.exceptions.RequestException: If the request fails or returns a non-200 status code.
+        CircuitOpenError: If cs.money requests are suspended after repeated failures.
+        ApiRequestError: If the request fails, times out or returns a non-200 status code.
     """
 
     json_data = {
@@ -103,31 +128,27 @@ def get_ext_images(skin_name: str) -> dict:
                     }""",
     }
 
-    response = requests.post(
-        "https://wiki.cs.money/api/graphql",
-        cookies=cookies,
-        headers=headers,
-        json=json_data,
-        timeout=10
+    response = await single_flight.do(
+        make_key("pattern_list", skin_name),
+        partial(
+            cs_money_breaker.call,
+            partial(post_json, config.CS_MONEY_API_ENDPOINT, json_data),
+        ),
     )
-    if response.status_code == 200:
-        data = response.json()["data"]["pattern_list"]
-        result = dict()
-        for img_obj in data:
-            if img_obj["exterior"] not in result:
-                img_id = img_obj["uuid"]
-                result[img_obj["exterior"]] = (
-                    f"{IMAGE_API_ENDPOINT}/wiki_{img_id}_preview.png"
-                )
-            else:
-                continue
-        return result
-    else:
-        print(f"Status code {response.status_code}")
-        raise requests.exceptions.RequestException
-
-
-def get_ex_rate(key: str):
+    data = response["data"]["pattern_list"]
+    result = dict()
+    for img_obj in data:
+        if img_obj["exterior"] not in result:
+            img_id = img_obj["uuid"]
+            result[img_obj["exterior"]] = (
+                f"{IMAGE_API_ENDPOINT}/wiki_{img_id}_preview.png"
+            )
+        else:
+            continue
+    return result
+
+
+async def get_ex_rate(key: str) -> int:
     """
     Retrieves the current exchange rate of a specified currency against USD.
 
@@ -138,19 +159,16 @@ def get_ex_rate(key: str):
         key (str): The currency code (e.g., 'CNY' for Chinese Yuan).
 
     Returns:
-        float: The current exchange rate rounded to the nearest whole number.
+        int: The current exchange rate rounded to the nearest whole number.
 
     Raises:
-        requests.exceptions.RequestException: If the request fails or returns a non-200 status code.
+        ApiRequestError: If the request fails, returns a non-200 status code or an API error.
     """
 
-    url = f"{CURRENCY_API_ENDPOINT}?api_key={config.CURRENCY_API_KEY}&from=USD&to={key}"
-    response = requests.get(url, timeout=10)
-    if response.status_code == 200:
-        res = response.json()
-        if res["error"] == 0:
-            return round(res["amount"])
-
-    else:
-        print(f"Status code {response.status_code}")
-        raise requests.exceptions.RequestException
+    params = {"api_key": config.CURRENCY_API_KEY, "from": "USD", "to": key}
+    res = await get_json(config.CURRENCY_API_ENDPOINT, params=params)
+    if res["error"] != 0:
+        raise ApiRequestError(
+            f"Currency API error {res['error']}: {res.get('error_message')}"
+        )
+    return round(res["amount"])
@@ -0,0 +1,152 @@
+"""
+Shared cache of exterior slider payloads.
+
+The payload of a skin (exterior images, prices, skin name and type) is built once and
+stored under a versioned key in Redis, so all users viewing the same skin reference one
+entry instead of keeping their own copy in FSM data. Concurrent requests for a payload
+that is not cached yet wait for a single build. Payloads built from stale data while
+cs.money is unavailable are kept only briefly, so fresh data replaces them soon.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio.client import Redis
+
+from bot.data import config
+
+
+class ExtPayloadCache:
+    """
+    Cache of exterior slider payloads keyed by skin ID.
+
+    Attributes:
+        version (int): Version of the payload layout, bump it when the layout changes.
+        ttl (int): Seconds a payload is kept before it is built again.
+        stale_ttl (int): Seconds a payload marked as stale is kept.
+    """
+
+    version = 1
+
+    def __init__(self, ttl: int, stale_ttl: int):
+        """
+        Initializes an empty cache that is not bound to Redis.
+
+        Args:
+            ttl (int): Seconds a payload is kept before it is built again.
+            stale_ttl (int): Seconds a payload marked as stale is kept.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.redis: Redis | None = None
+        self._local: dict[int, tuple[float, dict]] = {}
+        self._building: dict[int, asyncio.Future] = {}
+
+    def bind(self, redis: Redis):
+        """
+        Shares payloads through Redis.
+
+        Args:
+            redis (Redis): The Redis client to store payloads in.
+        """
+        self.redis = redis
+
+    def _key(self, skin_id: int) -> str:
+        return f"ext_payload:v{self.version}:{skin_id}"
+
+    async def get(self, skin_id: int) -> dict | None:
+        """
+        Returns the cached payload of a skin.
+
+        Args:
+            skin_id (int): The ID of the skin.
+
+        Returns:
+            dict | None: The payload, or None if it is not cached or expired.
+        """
+        entry = self._local.get(skin_id)
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+
+        if self.redis is not None:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._key(skin_id))
+                pipe.ttl(self._key(skin_id))
+                value, ttl = await pipe.execute()
+            if value is not None:
+                payload = json.loads(value)
+                self._local[skin_id] = (time.time() + max(ttl, 0), payload)
+                return payload
+
+        self._local.pop(skin_id, None)
+        return None
+
+    async def set(self, skin_id: int, payload: dict):
+        """
+        Stores the payload of a skin.
+
+        Args:
+            skin_id (int): The ID of the skin.
+            payload (dict): The JSON-serializable payload, with a true "stale" value if it
+                was built from stale data.
+        """
+        ttl = self.stale_ttl if payload.get("stale") else self.ttl
+        self._local[skin_id] = (time.time() + ttl, payload)
+        if self.redis is not None:
+            await self.redis.set(self._key(skin_id), json.dumps(payload), ex=ttl)
+
+    async def get_or_build(
+        self, skin_id: int, build: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """
+        Returns the cached payload of a skin, building it if necessary.
+
+        Only one build per skin runs at a time in this process, concurrent callers
+        wait for its result.
+
+        Args:
+            skin_id (int): The ID of the skin.
+            build (Callable): A coroutine function that builds the payload.
+
+        Returns:
+            dict: The payload of the skin.
+
+        Raises:
+            Exception: Any exception raised by build is passed to all waiting callers.
+        """
+        payload = await self.get(skin_id)
+        if payload is not None:
+            return payload
+
+        while (future := self._building.get(skin_id)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The build was cancelled together with its caller, try to build again.
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._building[skin_id] = future
+        try:
+            payload = await build()
+            await self.set(skin_id, payload)
+            future.set_result(payload)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # Mark the exception as retrieved when nobody else was waiting for it.
+            future.exception()
+            raise
+        finally:
+            del self._building[skin_id]
+        return payload
+
+
+ext_payload_cache = ExtPayloadCache(
+    ttl=config.EXT_PAYLOAD_TTL, stale_ttl=config.EXT_PAYLOAD_STALE_TTL
+)
@@ -0,0 +1,75 @@
+"""
+Persistent map of photo URLs to Telegram file_ids.
+
+Once Telegram has downloaded a photo by URL, the same photo can be sent by its file_id
+without another download. The map is kept in process memory and persisted in a Redis hash,
+so it survives restarts and is shared by all bot instances.
+"""
+
+from redis.asyncio.client import Redis
+
+
+class FileIdCache:
+    """Map of photo URLs to Telegram file_ids."""
+
+    redis_key = "tg_file_ids"
+
+    def __init__(self) -> None:
+        """Initializes an empty map that is not bound to Redis."""
+        self.redis: Redis | None = None
+        self._local: dict[str, str] = {}
+
+    def bind(self, redis: Redis):
+        """
+        Persists the map in Redis.
+
+        Args:
+            redis (Redis): The Redis client to store file_ids in.
+        """
+        self.redis = redis
+
+    async def get(self, url: str) -> str | None:
+        """
+        Returns the file_id of a photo URL.
+
+        Args:
+            url (str): The URL the photo was first sent by.
+
+        Returns:
+            str | None: The file_id of the photo, or None if it was never sent.
+        """
+        file_id = self._local.get(url)
+        if file_id is None and self.redis is not None:
+            value = await self.redis.hget(self.redis_key, url)
+            if value is not None:
+                file_id = value.decode() if isinstance(value, bytes) else value
+                self._local[url] = file_id
+        return file_id
+
+    async def set(self, url: str, file_id: str):
+        """
+        Stores the file_id of a photo URL.
+
+        Args:
+            url (str): The URL the photo was sent by.
+            file_id (str): The file_id Telegram returned for the photo.
+        """
+        if self._local.get(url) == file_id:
+            return
+        self._local[url] = file_id
+        if self.redis is not None:
+            await self.redis.hset(self.redis_key, url, file_id)
+
+    async def forget(self, url: str):
+        """
+        Removes the file_id of a photo URL, e.g. when Telegram no longer accepts it.
+
+        Args:
+            url (str): The URL the photo was sent by.
+        """
+        self._local.pop(url, None)
+        if self.redis is not None:
+            await self.redis.hdel(self.redis_key, url)
+
+
+file_id_cache = FileIdCache()
@@ -0,0 +1,190 @@
+"""
+TTL cache of cs.money prices keyed by name_id.
+
+Entries are shared between bot instances through Redis (or kept in process memory when
+no Redis client is bound). A fresh entry is served as is, an expired one is still served
+while a background task refreshes it (stale-while-revalidate), and only missing ids are
+requested from cs.money synchronously.
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+from redis.asyncio.client import Redis
+
+from bot.data import config
+from bot.utils.api.skins import get_ext_prices
+
+logger = logging.getLogger(__name__)
+
+
+class PriceCache:
+    """
+    Cache of the most recent prices for cs.money name_ids.
+
+    Attributes:
+        ttl (int): Seconds an entry is considered fresh.
+        stale_ttl (int): Extra seconds an expired entry may still be served while it is refreshed.
+        hits (int): Number of ids served from fresh entries.
+        stale_hits (int): Number of ids served from expired entries.
+        misses (int): Number of ids that had to be requested from cs.money.
+    """
+
+    key_prefix = "price:"
+
+    def __init__(self, ttl: int, stale_ttl: int):
+        """
+        Initializes an empty cache that is not bound to Redis.
+
+        Args:
+            ttl (int): Seconds an entry is considered fresh.
+            stale_ttl (int): Extra seconds an expired entry may still be served.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.redis: Redis | None = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._local: dict[int, tuple[float | None, float]] = {}
+        self._refreshing: set[int] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def bind(self, redis: Redis):
+        """
+        Shares cache entries through Redis instead of process memory.
+
+        Args:
+            redis (Redis): The Redis client to store entries in.
+        """
+        self.redis = redis
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters of the cache.
+
+        Returns:
+            dict: Numbers of fresh hits, stale hits and misses.
+        """
+        return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
+
+    async def _load(self, name_ids: list[int]) -> dict[int, tuple[float | None, float]]:
+        if self.redis is None:
+            now = time.time()
+            return {
+                name_id: entry
+                for name_id in name_ids
+                if (entry := self._local.get(name_id))
+                and now - entry[1] < self.ttl + self.stale_ttl
+            }
+
+        values = await self.redis.mget([f"{self.key_prefix}{i}" for i in name_ids])
+        return {
+            name_id: tuple(json.loads(value))
+            for name_id, value in zip(name_ids, values)
+            if value is not None
+        }
+
+    async def store(self, prices: dict, name_ids: list[int] | None = None):
+        """
+        Stores fetched prices in the cache.
+
+        Ids from name_ids that are absent in prices are cached as unknown, so they are
+        not requested again until the entry expires.
+
+        Args:
+            prices (dict): A dictionary mapping name_ids to prices.
+            name_ids (list[int], optional): All ids that were requested.
+        """
+        now = time.time()
+        entries: dict[int, tuple[float | None, float]] = {
+            name_id: (None, now) for name_id in name_ids or []
+        }
+        entries.update({name_id: (price, now) for name_id, price in prices.items()})
+        if not entries:
+            return
+
+        if self.redis is None:
+            self._local.update(entries)
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for name_id, entry in entries.items():
+                pipe.set(
+                    f"{self.key_prefix}{name_id}",
+                    json.dumps(entry),
+                    ex=self.ttl + self.stale_ttl,
+                )
+            await pipe.execute()
+
+    async def _fetch(self, name_ids: list[int]) -> dict:
+        prices = await get_ext_prices(name_ids)
+        await self.store(prices, name_ids)
+        return prices
+
+    async def _refresh(self, name_ids: list[int]):
+        try:
+            await self._fetch(name_ids)
+        except Exception:
+            logger.exception("Failed to refresh prices for %s name_ids", len(name_ids))
+        finally:
+            self._refreshing.difference_update(name_ids)
+
+    def _schedule_refresh(self, name_ids: list[int]):
+        name_ids = [name_id for name_id in name_ids if name_id not in self._refreshing]
+        if not name_ids:
+            return
+        self._refreshing.update(name_ids)
+        task = asyncio.create_task(self._refresh(name_ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def get_prices(self, name_ids: list) -> dict:
+        """
+        Returns prices for the given name_ids, requesting only missing ones from cs.money.
+
+        Expired entries are returned immediately and refreshed in the background.
+
+        Args:
+            name_ids (list): A list of cs.money name_ids, None values are ignored.
+
+        Returns:
+            dict: A dictionary mapping each known name_id to its most recent price.
+
+        Raises:
+            ApiRequestError: If missing prices could not be requested from cs.money.
+        """
+        name_ids = list(dict.fromkeys(i for i in name_ids if i))
+        entries = await self._load(name_ids)
+
+        now = time.time()
+        result: dict = {}
+        missing: list[int] = []
+        stale: list[int] = []
+        for name_id in name_ids:
+            if name_id not in entries:
+                missing.append(name_id)
+                continue
+            price, fetched_at = entries[name_id]
+            if now - fetched_at >= self.ttl:
+                stale.append(name_id)
+            if price is not None:
+                result[name_id] = price
+
+        self.misses += len(missing)
+        self.stale_hits += len(stale)
+        self.hits += len(name_ids) - len(missing) - len(stale)
+
+        if stale:
+            self._schedule_refresh(stale)
+        if missing:
+            result.update(await self._fetch(missing))
+
+        return result
+
+
+price_cache = PriceCache(
+    ttl=config.PRICE_CACHE_TTL, stale_ttl=config.PRICE_CACHE_STALE_TTL
+)
@@ -0,0 +1,144 @@
+"""
+Exchange rates served from memory and refreshed in the background.
+
+Rates are requested from Amdoren by a periodic job, kept in process memory and shared
+through Redis, so invoices never wait for the currency API and several bot instances
+spend the API quota only once per refresh interval.
+"""
+
+import json
+import logging
+import time
+
+from redis.asyncio.client import Redis
+
+from bot.data import config
+from bot.exceptions import ExchangeRateError
+from bot.utils.api.skins import get_ex_rate
+
+logger = logging.getLogger(__name__)
+
+
+class ExchangeRates:
+    """
+    Table of USD exchange rates for a fixed set of currencies.
+
+    Attributes:
+        currencies (tuple[str, ...]): Currency codes to keep rates for.
+        refresh_interval (int): Seconds after which a rate is requested again.
+        max_age (int): Seconds after which a rate is too old to be used for invoices.
+    """
+
+    redis_key = "exchange_rates"
+
+    def __init__(self, currencies: list[str], refresh_interval: int, max_age: int):
+        """
+        Initializes an empty table that is not bound to Redis.
+
+        Args:
+            currencies (list[str]): Currency codes to keep rates for.
+            refresh_interval (int): Seconds after which a rate is requested again.
+            max_age (int): Seconds after which a rate is too old to be used.
+        """
+        self.currencies = tuple(currencies)
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.redis: Redis | None = None
+        self._rates: dict[str, tuple[int, float]] = {}
+
+    def bind(self, redis: Redis):
+        """
+        Shares rates through Redis.
+
+        Args:
+            redis (Redis): The Redis client to store rates in.
+        """
+        self.redis = redis
+
+    async def load(self):
+        """Loads the last known rates from Redis into memory."""
+        if self.redis is None:
+            return
+
+        values = await self.redis.hgetall(self.redis_key)
+        for key, value in values.items():
+            currency = key.decode() if isinstance(key, bytes) else key
+            rate, fetched_at = json.loads(value)
+            if fetched_at > self._rates.get(currency, (0, 0.0))[1]:
+                self._rates[currency] = (rate, fetched_at)
+
+    async def refresh(self):
+        """
+        Requests rates that are older than the refresh interval.
+
+        Rates refreshed by another bot instance are taken from Redis instead. If a request
+        fails, the last good rate is kept.
+        """
+        await self.load()
+
+        now = time.time()
+        for currency in self.currencies:
+            _, fetched_at = self._rates.get(currency, (0, 0.0))
+            if now - fetched_at < self.refresh_interval:
+                continue
+
+            try:
+                rate = await get_ex_rate(currency)
+            except Exception:
+                logger.exception("Failed to refresh %s exchange rate", currency)
+                continue
+
+            self._rates[currency] = (rate, time.time())
+            if self.redis is not None:
+                await self.redis.hset(
+                    self.redis_key, currency, json.dumps(self._rates[currency])
+                )
+
+    async def get_fresh_rate(self, key: str) -> int:
+        """
+        Returns the exchange rate of a currency, reloading rates from Redis first if the
+        rate in memory is missing or due for a refresh.
+
+        Only one bot process refreshes rates, the others pick up its results here.
+
+        Args:
+            key (str): The currency code (e.g., 'RUB').
+
+        Returns:
+            int: The last known exchange rate.
+
+        Raises:
+            ExchangeRateError: If the rate is unknown or older than the maximum age.
+        """
+        _, fetched_at = self._rates.get(key, (0, 0.0))
+        if time.time() - fetched_at >= self.refresh_interval:
+            await self.load()
+        return self.get_rate(key)
+
+    def get_rate(self, key: str) -> int:
+        """
+        Returns the exchange rate of a currency against USD without any network I/O.
+
+        Args:
+            key (str): The currency code (e.g., 'RUB').
+
+        Returns:
+            int: The last known exchange rate.
+
+        Raises:
+            ExchangeRateError: If the rate is unknown or older than the maximum age.
+        """
+        if key not in self._rates:
+            raise ExchangeRateError(f"Exchange rate for {key} is not loaded yet.")
+
+        rate, fetched_at = self._rates[key]
+        if time.time() - fetched_at > self.max_age:
+            raise ExchangeRateError(f"Exchange rate for {key} is outdated.")
+        return rate
+
+
+exchange_rates = ExchangeRates(
+    currencies=config.EXCHANGE_CURRENCIES,
+    refresh_interval=config.EXCHANGE_RATE_REFRESH_INTERVAL,
+    max_age=config.EXCHANGE_RATE_MAX_AGE,
+)
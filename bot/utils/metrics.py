@@ -0,0 +1,338 @@
+"""
+Process metrics in the Prometheus text format.
+
+Counters and histograms are kept in process memory and rendered on request by a small
+aiohttp server (see start_metrics_server). Values that already live elsewhere, such as
+cache or connection pool statistics, are read at scrape time by registered collectors.
+
+Metrics:
+    - UPDATES: Updates received, by update type.
+    - HANDLER_LATENCY: Handler execution time, by router and handler.
+    - API_LATENCY / API_ERRORS: External API request time and failures, by host and method.
+    - DB_QUERY_LATENCY: Database statement execution time, by statement type.
+    - FSM_LATENCY: FSM storage operation time, by operation.
+    - SLIDER_CLICKS_COALESCED: Slider navigation clicks merged into a running one.
+    - TELEGRAM_QUEUE_WAIT / TELEGRAM_RETRY_AFTER: Time Bot API requests wait for rate limits,
+      by priority, and requests rejected with 429, by method.
+Functions:
+    - register_collector: Registers a function that returns gauge values at scrape time.
+    - unregister_collector: Removes a function registered with register_collector.
+    - render_metrics: Renders all metrics in the Prometheus text format.
+    - start_metrics_server: Serves metrics over HTTP.
+    - instrument_engine: Measures statement execution time of a database engine.
+"""
+
+import logging
+import math
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiohttp import web
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metrics: list["Counter | Histogram"] = []
+_collectors: dict[str, tuple[str, Callable[[], dict[str, float]]]] = {}
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], **extra) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The metric description.
+        labelnames (tuple[str, ...]): Names of the labels.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        _metrics.append(self)
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        """
+        Increments the counter.
+
+        Args:
+            *labelvalues (str): Values of the labels in the order of labelnames.
+            amount (float): The amount to add. Defaults to 1.
+        """
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labelvalues, value in self._values.items():
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Histogram:
+    """
+    Histogram of observed values with optional labels.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The metric description.
+        labelnames (tuple[str, ...]): Names of the labels.
+        buckets (tuple[float, ...]): Upper bounds of the buckets, +Inf is added automatically.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = (*sorted(buckets), math.inf)
+        # Per label values: counts per bucket (not cumulative), sum of observed values.
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        _metrics.append(self)
+
+    def observe(self, value: float, *labelvalues: str):
+        """
+        Records an observed value.
+
+        Args:
+            value (float): The observed value, e.g. a duration in seconds.
+            *labelvalues (str): Values of the labels in the order of labelnames.
+        """
+        entry = self._values.get(labelvalues)
+        if entry is None:
+            entry = self._values[labelvalues] = ([0] * len(self.buckets), [0.0])
+        counts, total = entry
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        total[0] += value
+
+    @contextmanager
+    def time(self, *labelvalues: str) -> Iterator[None]:
+        """
+        Observes the execution time of the block in seconds.
+
+        Args:
+            *labelvalues (str): Values of the labels in the order of labelnames.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labelvalues, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(
+                    self.labelnames, labelvalues, le=_format_value(bound)
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total[0])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+UPDATES = Counter("bot_updates_total", "Updates received by type.", ("type",))
+HANDLER_LATENCY = Histogram(
+    "bot_handler_duration_seconds",
+    "Handler execution time.",
+    ("router", "handler"),
+)
+API_LATENCY = Histogram(
+    "bot_api_request_duration_seconds",
+    "External API request time.",
+    ("host", "method"),
+)
+API_ERRORS = Counter(
+    "bot_api_request_errors_total",
+    "External API requests that failed or returned a non-200 status.",
+    ("host", "method"),
+)
+DB_QUERY_LATENCY = Histogram(
+    "bot_db_query_duration_seconds",
+    "Database statement execution time.",
+    ("statement",),
+)
+FSM_LATENCY = Histogram(
+    "bot_fsm_storage_duration_seconds",
+    "FSM storage operation time.",
+    ("operation",),
+)
+SLIDER_CLICKS_COALESCED = Counter(
+    "bot_slider_clicks_coalesced_total",
+    "Slider navigation clicks merged into the handling of an earlier click.",
+)
+TELEGRAM_QUEUE_WAIT = Histogram(
+    "bot_telegram_queue_wait_seconds",
+    "Time Bot API requests wait for rate limit tokens.",
+    ("priority",),
+)
+TELEGRAM_RETRY_AFTER = Counter(
+    "bot_telegram_retry_after_total",
+    "Bot API requests rejected with 429 Too Many Requests.",
+    ("method",),
+)
+
+
+def register_collector(name: str, help: str, collect: Callable[[], dict[str, float]]):
+    """
+    Registers a function that returns gauge values at scrape time.
+
+    Each key of the returned dict becomes the value of the "name" label of the gauge.
+    Registering a gauge name again replaces the previous function.
+
+    Args:
+        name (str): The gauge name.
+        help (str): The gauge description.
+        collect (Callable): A function returning current values by name.
+    """
+    _collectors[name] = (help, collect)
+
+
+def unregister_collector(name: str):
+    """
+    Removes a function registered with register_collector, if any.
+
+    Args:
+        name (str): The gauge name.
+    """
+    _collectors.pop(name, None)
+
+
+def render_metrics() -> str:
+    """
+    Renders all metrics in the Prometheus text format.
+
+    Returns:
+        str: The exposition text.
+    """
+    lines: list[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for name, (help, collect) in list(_collectors.items()):
+        try:
+            values = collect()
+        except Exception:
+            logger.exception("Metrics collector %s failed", name)
+            continue
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} gauge")
+        for key, value in values.items():
+            labels = _format_labels(("name",), (key,))
+            lines.append(f"{name}{labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+async def _handle_metrics(request: web.Request) -> web.Response:
+    return web.Response(text=render_metrics(), content_type="text/plain")
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """
+    Serves metrics over HTTP at /metrics.
+
+    Args:
+        host (str): The interface to listen on.
+        port (int): The port to listen on.
+
+    Returns:
+        web.AppRunner: The runner of the server, call its cleanup() to stop it.
+    """
+    app = web.Application()
+    app.router.add_get("/metrics", _handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host=host, port=port).start()
+    logger.info("Serving metrics on %s:%s/metrics", host, port)
+    return runner
+
+
+def instrument_engine(engine: AsyncEngine):
+    """
+    Measures statement execution time of a database engine, failed statements excluded.
+
+    Args:
+        engine (AsyncEngine): The engine to instrument.
+    """
+
+    # The start time is kept on the execution context, which is discarded together with it
+    # when the statement fails and after_cursor_execute is not called.
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        start = getattr(context, "_query_start", None)
+        if start is None:
+            return
+        statement_type = statement.lstrip().split(" ", 1)[0].upper()
+        DB_QUERY_LATENCY.observe(time.perf_counter() - start, statement_type)
+
+
+class InstrumentedStorage(BaseStorage):
+    """
+    FSM storage wrapper that measures the time of storage operations.
+
+    Attributes:
+        storage (BaseStorage): The wrapped storage.
+    """
+
+    def __init__(self, storage: BaseStorage):
+        self.storage = storage
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        with FSM_LATENCY.time("set_state"):
+            await self.storage.set_state(key, state)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        with FSM_LATENCY.time("get_state"):
+            return await self.storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        with FSM_LATENCY.time("set_data"):
+            await self.storage.set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        with FSM_LATENCY.time("get_data"):
+            return await self.storage.get_data(key)
+
+    async def close(self) -> None:
+        await self.storage.close()
@@ -3,21 +3,25 @@ import logging
 from aiogram import Bot
 
 from bot.data import config
+from bot.middlewares import broadcast_priority
 
 
 async def on_startup_notify(bot: Bot):
     """
     Sends a startup notification to admins when the bot is launched.
 
+    Messages are sent with broadcast priority, after requests of users.
+
     Args:
         bot (Bot): The instance of the bot used to send the notification.
 
     Raises:
         Exception: If the notification could not be sent due to communication issues.
     """
-    for admin in config.ADMINS:
-        try:
-            text = "Bot started"
-            await bot.send_message(chat_id=admin, text=text)
-        except Exception as err:
-            logging.exception(err)
+    with broadcast_priority():
+        for admin in config.ADMINS:
+            try:
+                text = "Bot started"
+                await bot.send_message(chat_id=admin, text=text)
+            except Exception as err:
+                logging.exception(err)
@@ -0,0 +1,115 @@
+"""
+Replays recorded Telegram updates against a running webhook.
+
+Reads updates from a file with one JSON update per line and POSTs them to the webhook
+with the secret token header, the way Telegram does. Useful to test webhook mode locally
+and to compare instances behind a load balancer.
+
+Usage:
+    python -m bot.utils.replay_updates updates.jsonl [--url URL] [--concurrency N] [--repeat N]
+
+Functions:
+    - load_updates: Reads recorded updates from a JSON lines file.
+    - replay_updates: POSTs updates to the webhook and collects response statuses and latencies.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+
+import aiohttp
+
+from bot.data import config
+
+
+def load_updates(path: Path) -> list[dict]:
+    """
+    Reads recorded updates from a JSON lines file.
+
+    Args:
+        path (Path): The file with one JSON update per line, empty lines are skipped.
+
+    Returns:
+        list[dict]: The updates in file order.
+    """
+    with path.open(encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+async def replay_updates(
+    updates: list[dict], url: str, secret: str | None, concurrency: int
+) -> tuple[Counter, list[float]]:
+    """
+    POSTs updates to the webhook and collects response statuses and latencies.
+
+    Args:
+        updates (list[dict]): The updates to send, in order.
+        url (str): The webhook URL.
+        secret (str | None): The secret token sent in X-Telegram-Bot-Api-Secret-Token.
+        concurrency (int): The maximum number of requests in flight.
+
+    Returns:
+        tuple: A Counter of response statuses (or error names) and a list of latencies in seconds.
+    """
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+    statuses: Counter = Counter()
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(session: aiohttp.ClientSession, update: dict):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with session.post(url, json=update, headers=headers) as resp:
+                    await resp.read()
+                    statuses[resp.status] += 1
+            except (aiohttp.ClientError, TimeoutError) as err:
+                statuses[type(err).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(send(session, update) for update in updates))
+    return statuses, latencies
+
+
+def main():
+    """Parses command line arguments, replays the updates and prints a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("file", type=Path, help="JSON lines file with updates")
+    parser.add_argument(
+        "--url",
+        default=f"http://localhost:{config.WEBHOOK_PORT}{config.WEBHOOK_PATH}",
+        help="webhook URL (default: local webhook from config)",
+    )
+    parser.add_argument(
+        "--secret",
+        default=config.WEBHOOK_SECRET,
+        help="secret token (default: webhook_secret from config)",
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    updates = load_updates(args.file) * args.repeat
+    start = time.perf_counter()
+    statuses, latencies = asyncio.run(
+        replay_updates(updates, args.url, args.secret, args.concurrency)
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"Sent {len(updates)} updates in {elapsed:.2f}s")
+    print("Statuses:", dict(statuses))
+    if len(latencies) >= 2:
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"Latency p50={quantiles[49] * 1000:.1f}ms "
+            f"p95={quantiles[94] * 1000:.1f}ms p99={quantiles[98] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from bot.data import config
+
+logger = logging.getLogger(__name__)
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot):
+    """
+    Serves updates from a Telegram webhook on an aiohttp application until cancelled.
+
+    Registers the webhook URL with Telegram and starts an HTTP server that feeds received
+    updates to the dispatcher. Requests without the configured secret token are rejected.
+    Updates are handled within the request, so the number of updates processed at once is
+    bounded by the max_connections value of the webhook, shared by all instances behind
+    the webhook URL.
+
+    Args:
+        dp (Dispatcher): The dispatcher to feed updates to.
+        bot (Bot): The bot instance the updates are received for.
+
+    Raises:
+        RuntimeError: If the webhook URL or secret token is not configured.
+    """
+    if not config.WEBHOOK_BASE_URL or not config.WEBHOOK_SECRET:
+        raise RuntimeError("Webhook mode requires webhook_base_url and webhook_secret.")
+
+    await bot.set_webhook(
+        url=config.WEBHOOK_BASE_URL.rstrip("/") + config.WEBHOOK_PATH,
+        secret_token=config.WEBHOOK_SECRET,
+        max_connections=config.WEBHOOK_MAX_CONNECTIONS,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=False,
+        secret_token=config.WEBHOOK_SECRET,
+    ).register(app, path=config.WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=config.WEBHOOK_HOST, port=config.WEBHOOK_PORT)
+    await site.start()
+    logger.info(
+        "Listening for updates on %s:%s%s",
+        config.WEBHOOK_HOST,
+        config.WEBHOOK_PORT,
+        config.WEBHOOK_PATH,
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,221 @@
+"""
+Multi-process mode: a supervisor polls updates and shards them across worker processes.
+
+Each worker process runs its own event loop with its own bot, dispatcher and database pool,
+while FSM data and caches are shared through Redis. Only the first worker runs background
+refreshers, the others read exchange rates from Redis when theirs are due for a refresh
+and reload the catalog when a reload is announced. A worker that dies is restarted.
+
+Updates are routed to workers by user ID, so all updates of a user are handled by the same
+worker, and the worker handles them one after another, which keeps FSM transitions of a
+user ordered. Slider navigation clicks of a user on the same message that queue up behind
+another update are handled together, so SliderThrottleMiddleware coalesces them into one
+slider update. Updates of different users are handled concurrently.
+
+Functions:
+    - get_shard_key: Returns the ID that decides which worker handles an update.
+    - get_slider_key: Returns the slider message a raw slider navigation update belongs to.
+    - run_worker: Entry point of a worker process.
+    - run_supervisor: Starts worker processes and feeds them polled updates.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from functools import partial
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.types import Update
+
+from bot.data import config
+from bot.loader import start_bot
+from bot.middlewares.throttling import SLIDER_DELTAS
+from bot.utils.notify_admins import on_startup_notify
+from bot.utils.set_bot_commands import set_default_commands
+
+logger = logging.getLogger(__name__)
+
+
+def get_shard_key(update: Update) -> int:
+    """
+    Returns the ID that decides which worker handles an update.
+
+    Args:
+        update (Update): The update received from Telegram.
+
+    Returns:
+        int: The ID of the user who caused the update, the chat ID for updates without
+        a user, or 0 for updates without both.
+    """
+    event = update.event
+    user = getattr(event, "from_user", None)
+    if user is not None:
+        return user.id
+    chat = getattr(event, "chat", None)
+    if chat is not None:
+        return chat.id
+    return 0
+
+
+def get_slider_key(update: dict) -> int | str | None:
+    """
+    Returns the slider message a raw slider navigation update belongs to.
+
+    Args:
+        update (dict): The raw update received from Telegram.
+
+    Returns:
+        int | str | None: The message ID or inline message ID of the slider, or None if
+        the update is not a slider navigation click.
+    """
+    callback_query = update.get("callback_query")
+    if not callback_query or callback_query.get("data") not in SLIDER_DELTAS:
+        return None
+    message = callback_query.get("message") or {}
+    return message.get("message_id") or callback_query.get("inline_message_id") or ""
+
+
+async def _consume(index: int, queue: Queue):
+    # Only the first worker runs background refreshers, see the module docstring.
+    # Each worker serves its metrics on its own port.
+    metrics_port = config.METRICS_PORT + index if config.METRICS_PORT else 0
+    async with start_bot(
+        run_jobs=index == 0 and config.RUN_JOBS, metrics_port=metrics_port
+    ) as (bot, dp):
+        loop = asyncio.get_running_loop()
+        # The last scheduled task of each user, so the next update of the user waits for it.
+        user_tasks: dict[int, asyncio.Task] = {}
+        # Slider clicks the last task of a user will handle, until the task starts.
+        user_clicks: dict[int, list[dict]] = {}
+
+        async def feed(
+            user_id: int, updates: list[dict], previous: asyncio.Task | None
+        ):
+            if previous is not None:
+                await asyncio.wait([previous])
+            if user_clicks.get(user_id) is updates:
+                del user_clicks[user_id]
+            # Clicks are handled concurrently, so the throttling middleware coalesces them.
+            results = await asyncio.gather(
+                *(dp.feed_raw_update(bot, update) for update in updates),
+                return_exceptions=True,
+            )
+            for update, result in zip(updates, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        "Failed to handle update %s",
+                        update.get("update_id"),
+                        exc_info=result,
+                    )
+
+        def forget(user_id: int, task: asyncio.Task):
+            if user_tasks.get(user_id) is task:
+                del user_tasks[user_id]
+
+        while (item := await loop.run_in_executor(None, queue.get)) is not None:
+            user_id, update = item
+            slider_key = get_slider_key(update)
+            clicks = user_clicks.get(user_id)
+            if (
+                slider_key is not None
+                and clicks is not None
+                and get_slider_key(clicks[0]) == slider_key
+            ):
+                clicks.append(update)
+                continue
+
+            updates = [update]
+            task = asyncio.create_task(feed(user_id, updates, user_tasks.get(user_id)))
+            task.add_done_callback(partial(forget, user_id))
+            user_tasks[user_id] = task
+            if slider_key is not None:
+                user_clicks[user_id] = updates
+            else:
+                # Later clicks must not be handled before this update.
+                user_clicks.pop(user_id, None)
+
+        if user_tasks:
+            await asyncio.wait(list(user_tasks.values()))
+
+
+def run_worker(index: int, queue: Queue):
+    """
+    Entry point of a worker process.
+
+    Handles updates from the queue until it receives None.
+
+    Args:
+        index (int): The number of the worker, starting from 0.
+        queue (Queue): The queue of (shard key, raw update) pairs for this worker.
+    """
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_consume(index, queue))
+
+
+def _start_worker(context: Any, index: int, queue: Queue) -> BaseProcess:
+    worker = context.Process(
+        target=run_worker, args=(index, queue), name=f"bot-worker-{index}"
+    )
+    worker.start()
+    return worker
+
+
+def _restart_dead_workers(
+    context: Any, workers: list[BaseProcess], queues: list[Queue]
+):
+    for i, worker in enumerate(workers):
+        if not worker.is_alive():
+            logger.error(
+                "Worker %s exited with code %s, restarting it", i, worker.exitcode
+            )
+            workers[i] = _start_worker(context, i, queues[i])
+
+
+async def run_supervisor(worker_count: int):
+    """
+    Starts worker processes and feeds them polled updates until cancelled.
+
+    Polls updates with getUpdates and puts each one into the queue of the worker chosen
+    by get_shard_key. Workers that died are restarted and continue with the updates left in
+    their queue. On exit, workers finish the updates they already received.
+
+    Args:
+        worker_count (int): The number of worker processes to start.
+    """
+    context = multiprocessing.get_context("spawn")
+    queues: list[Queue] = [context.Queue() for _ in range(worker_count)]
+    workers = [_start_worker(context, i, queue) for i, queue in enumerate(queues)]
+
+    bot = Bot(token=config.BOT_TOKEN, default=DefaultBotProperties(parse_mode="HTML"))
+    try:
+        await set_default_commands(bot=bot)
+        await on_startup_notify(bot=bot)
+        # getUpdates is rejected while a webhook is set.
+        await bot.delete_webhook()
+
+        offset = None
+        while True:
+            _restart_dead_workers(context, workers, queues)
+            try:
+                updates = await bot.get_updates(offset=offset, timeout=30)
+            except Exception:
+                logger.exception("Failed to get updates")
+                await asyncio.sleep(1)
+                continue
+
+            for update in updates:
+                key = get_shard_key(update)
+                raw = update.model_dump(mode="json", by_alias=True, exclude_unset=True)
+                queues[key % worker_count].put((key, raw))
+                offset = update.update_id + 1
+    finally:
+        for queue in queues:
+            queue.put(None)
+        loop = asyncio.get_running_loop()
+        for worker in workers:
+            await loop.run_in_executor(None, worker.join)
+        await bot.session.close()